@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from core.booking import cancel_orders, release_holds
 from core.models import (
     Flight,
     Crew,
@@ -12,6 +13,8 @@ from core.models import (
     Airport,
     City,
     Country,
+    SeatHold,
+    BookingRequest,
 )
 
 
@@ -56,6 +59,57 @@ class TicketInLine(admin.TabularInline):
 class OrderAdmin(admin.ModelAdmin):
     inlines = (TicketInLine,)
 
+    def delete_model(self, request, obj):
+        cancel_orders(Order.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        cancel_orders(queryset)
+
+
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "flight",
+        "row",
+        "seat",
+        "user",
+        "expires_at",
+    )
+
+    # Holds change seats_remaining, so they are only created through
+    # hold_seats and removed through release_holds.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        release_holds(SeatHold.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        release_holds(queryset)
+
+
+class BookingRequestAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "user",
+        "flight",
+        "status",
+        "status_code",
+        "created_at",
+        "processed_at",
+    )
+    list_filter = ("status",)
+
+    # Requests are only changed by the workers of process_bookings.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 admin.site.register(Flight)
 admin.site.register(Crew, CrewAdmin)
@@ -68,3 +122,5 @@ admin.site.register(Route)
 admin.site.register(Airport, AirportAdmin)
 admin.site.register(City, CityAdmin)
 admin.site.register(Country)
+admin.site.register(SeatHold, SeatHoldAdmin)
+admin.site.register(BookingRequest, BookingRequestAdmin)
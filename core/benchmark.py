@@ -0,0 +1,264 @@
+import math
+import multiprocessing
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.booking import booking_strategy
+from core.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Route,
+    SeatHold,
+    Ticket,
+)
+from core.views import OrderViewSet
+
+CREATED = "created"
+CONFLICT = "conflict"
+ERROR = "error"
+
+
+def percentile(values, percent: float) -> float:
+    """Nearest-rank percentile, 0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+class BenchmarkFixture:
+    """A throwaway hot flight plus one user per worker."""
+
+    def __init__(self, rows: int, seats_in_row: int, workers: int):
+        tag = f"benchmark-{uuid.uuid4().hex[:8]}"
+        self.country = Country.objects.create(name=tag)
+        source, destination = (
+            Airport.objects.create(
+                name=f"{tag}-{name}",
+                city=City.objects.create(
+                    name=f"{tag}-{name}", country=self.country
+                ),
+            )
+            for name in ("source", "destination")
+        )
+        self.route = Route.objects.create(
+            source=source, destination=destination, distance=1000
+        )
+        self.airplane = Airplane.objects.create(
+            name=tag,
+            rows=rows,
+            seats_in_row=seats_in_row,
+            airplane_type=AirplaneType.objects.create(name=tag),
+        )
+        departure = timezone.now() + timedelta(days=30)
+        self.flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=2),
+        )
+        self.users = [
+            get_user_model().objects.create_user(
+                email=f"{tag}-{index}@example.com"
+            )
+            for index in range(workers)
+        ]
+
+    def delete(self):
+        self.flight.delete()
+        for user in self.users:
+            user.delete()
+        self.route.delete()
+        for airport in (self.route.source, self.route.destination):
+            airport.delete()
+            airport.city.delete()
+        self.country.delete()
+        self.airplane.delete()
+        self.airplane.airplane_type.delete()
+
+
+def book_randomly(
+        flight_id: int,
+        user_id: int,
+        orders: int,
+        seats_per_order: int,
+        seed: int,
+) -> list[tuple[float, str]]:
+    """Post ``orders`` random orders as one user; (seconds, outcome) each."""
+    view = OrderViewSet.as_view({"post": "create"}, throttle_classes=())
+    factory = APIRequestFactory()
+    user = get_user_model().objects.get(pk=user_id)
+    rows, seats_in_row = Flight.objects.values_list(
+        "airplane__rows", "airplane__seats_in_row"
+    ).get(pk=flight_id)
+    seats = [
+        (row, seat)
+        for row in range(1, rows + 1)
+        for seat in range(1, seats_in_row + 1)
+    ]
+    rng = random.Random(seed)
+
+    results = []
+    try:
+        for _ in range(orders):
+            request = factory.post(
+                "/api/core/orders/",
+                {
+                    "tickets": [
+                        {"flight": flight_id, "row": row, "seat": seat}
+                        for row, seat in rng.sample(seats, seats_per_order)
+                    ]
+                },
+                format="json",
+            )
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            try:
+                response = view(request)
+            except Exception:
+                outcome = ERROR
+            else:
+                outcome = {201: CREATED, 409: CONFLICT}.get(
+                    response.status_code, ERROR
+                )
+            results.append((time.perf_counter() - started, outcome))
+    finally:
+        connection.close()
+    return results
+
+
+def check_integrity(flight_id: int) -> dict:
+    """Double-sold seats, out-of-bounds seats and counter drift."""
+    flight = Flight.objects.select_related("airplane").get(pk=flight_id)
+    tickets = Ticket.objects.filter(flight_id=flight_id)
+    duplicates = (
+        tickets.values("row", "seat")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .count()
+    )
+    out_of_bounds = tickets.filter(
+        Q(row__lt=1)
+        | Q(row__gt=flight.airplane.rows)
+        | Q(seat__lt=1)
+        | Q(seat__gt=flight.airplane.seats_in_row)
+    ).count()
+    sold = tickets.count()
+    held = SeatHold.objects.filter(flight_id=flight_id).count()
+    expected_remaining = (
+        flight.airplane.rows * flight.airplane.seats_in_row - sold - held
+    )
+    return {
+        "tickets": sold,
+        "duplicate_seats": duplicates,
+        "out_of_bounds_seats": out_of_bounds,
+        "seats_remaining": flight.seats_remaining,
+        "seats_remaining_expected": expected_remaining,
+        "ok": (
+            duplicates == 0
+            and out_of_bounds == 0
+            and flight.seats_remaining == expected_remaining
+        ),
+    }
+
+
+def run_benchmark(
+        flight_id: int,
+        user_ids: list[int],
+        orders_per_worker: int,
+        seats_per_order: int,
+        mode: str = "thread",
+        seed: int = 0,
+) -> dict:
+    """Hammer one flight from ``len(user_ids)`` workers and summarize."""
+    if mode == "process":
+        # Children must open their own connections instead of sharing ours.
+        connections.close_all()
+        executor = ProcessPoolExecutor(
+            max_workers=len(user_ids),
+            mp_context=multiprocessing.get_context("fork"),
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=len(user_ids))
+
+    started = time.perf_counter()
+    with executor:
+        futures = [
+            executor.submit(
+                book_randomly,
+                flight_id,
+                user_id,
+                orders_per_worker,
+                seats_per_order,
+                seed + index,
+            )
+            for index, user_id in enumerate(user_ids)
+        ]
+        results = [
+            result for future in futures for result in future.result()
+        ]
+    elapsed = time.perf_counter() - started
+
+    latencies = [seconds * 1000 for seconds, _ in results]
+    outcomes = [outcome for _, outcome in results]
+    return {
+        "database": connection.vendor,
+        "strategy": booking_strategy(),
+        "mode": mode,
+        "workers": len(user_ids),
+        "orders_per_worker": orders_per_worker,
+        "seats_per_order": seats_per_order,
+        "orders": len(results),
+        "created": outcomes.count(CREATED),
+        "conflicts": outcomes.count(CONFLICT),
+        "errors": outcomes.count(ERROR),
+        "conflict_rate": round(
+            outcomes.count(CONFLICT) / len(results), 4
+        ) if results else 0.0,
+        "elapsed_seconds": round(elapsed, 3),
+        "orders_per_second": round(
+            outcomes.count(CREATED) / elapsed, 2
+        ) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        },
+        "integrity": check_integrity(flight_id),
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict) -> dict:
+    """Relative change of the headline numbers against an earlier run."""
+    def change(current, previous):
+        if not previous:
+            return None
+        return round((current - previous) / previous, 4)
+
+    return {
+        "orders_per_second": change(
+            report["orders_per_second"], baseline["orders_per_second"]
+        ),
+        "conflict_rate": change(
+            report["conflict_rate"], baseline["conflict_rate"]
+        ),
+        **{
+            f"latency_ms.{name}": change(
+                report["latency_ms"][name], baseline["latency_ms"][name]
+            )
+            for name in ("p50", "p95", "p99")
+        },
+    }
@@ -0,0 +1,524 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+
+from core.cache import invalidate_flights
+from core.dimensions import airplane_dimensions
+from core.models import Flight, Order, SeatHold, Ticket
+from core.seatmap import SeatMap
+
+PESSIMISTIC = "pessimistic"
+OPTIMISTIC = "optimistic"
+SKIP_LOCKED = "skip_locked"
+STRATEGIES = (PESSIMISTIC, OPTIMISTIC, SKIP_LOCKED)
+
+SOLD = "sold"
+HELD = "held"
+CONTENTION = "contention"
+NO_BLOCK = "no_block"
+
+# Set while cancel_tickets deletes tickets; the per-ticket signals in
+# core.signals leave their work to it, which does it once per flight.
+bulk_cancellation = ContextVar("bulk_cancellation", default=False)
+
+
+class SeatConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are not available."
+    default_code = "seat_conflict"
+
+    def __init__(self, conflicts: list[dict], strategy: str):
+        super().__init__()
+        # Keep seat numbers as numbers instead of coercing them to strings.
+        self.detail = {
+            "detail": self.default_detail,
+            "code": self.default_code,
+            "strategy": strategy,
+            "conflicts": conflicts,
+        }
+
+
+def booking_strategy() -> str:
+    strategy = getattr(settings, "BOOKING_CONCURRENCY", PESSIMISTIC)
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown BOOKING_CONCURRENCY {strategy!r}")
+    return strategy
+
+
+def seat_errors(ticket: dict, dimensions) -> dict:
+    """Problems with one requested seat, keyed like serializer errors."""
+    if dimensions is None:
+        return {"flight": f"Flight {ticket['flight']} does not exist"}
+    errors = {}
+    for field_name, max_value in zip(("row", "seat"), dimensions):
+        try:
+            Ticket.validate_value(
+                ticket[field_name], max_value, field_name, ValueError
+            )
+        except ValueError as error:
+            errors.update(error.args[0])
+    return errors
+
+
+def seat_key(ticket: dict) -> tuple:
+    return ticket["flight"], ticket["row"], ticket["seat"]
+
+
+def request_errors(tickets: list[dict], dimensions: dict) -> list[dict]:
+    requested = Counter(seat_key(ticket) for ticket in tickets)
+    errors = []
+    for ticket in tickets:
+        error = seat_errors(ticket, dimensions.get(ticket["flight"]))
+        if not error and requested[seat_key(ticket)] > 1:
+            error = {"seat": "Seat is requested more than once"}
+        errors.append(error)
+    return errors
+
+
+def seats_filter(seats) -> Q:
+    seat_filter = Q()
+    for row, seat in seats:
+        seat_filter |= Q(row=row, seat=seat)
+    return seat_filter
+
+
+def taken_seats(flight_id: int, seats, user) -> dict:
+    """Why each of ``seats`` is unavailable to ``user``; all seats if None.
+
+    A seat is unavailable when it is sold or held by someone else.
+    """
+    seat_filter = Q() if seats is None else seats_filter(seats)
+    held = SeatHold.objects.active().filter(
+        seat_filter, flight_id=flight_id
+    ).exclude(user=user).values_list("row", "seat")
+    sold = Ticket.objects.filter(
+        seat_filter, flight_id=flight_id
+    ).values_list("row", "seat")
+    return {
+        **dict.fromkeys(held, HELD),
+        **dict.fromkeys(sold, SOLD),
+    }
+
+
+def flight_dimensions(flight_ids, lock=False, skip_locked=False) -> dict:
+    """Airplane dimensions per flight, optionally locking in id order."""
+    queryset = Flight.objects.filter(pk__in=flight_ids).order_by("id")
+    if lock:
+        queryset = queryset.select_for_update(
+            of=("self",), skip_locked=skip_locked
+        )
+    return {
+        flight_id: (rows, seats_in_row)
+        for flight_id, rows, seats_in_row in queryset.values_list(
+            "id", "airplane__rows", "airplane__seats_in_row"
+        )
+    }
+
+
+def lock_flights(flight_ids) -> dict:
+    """Lock flights in id order and return their airplane dimensions."""
+    return flight_dimensions(flight_ids, lock=True)
+
+
+def try_lock_flights(flight_ids) -> bool:
+    """Lock all ``flight_ids`` without waiting; False if one is busy.
+
+    The flights locked before a busy one was found are released again,
+    so a failed try never holds locks while the caller backs off.
+    """
+    savepoint = transaction.savepoint()
+    locked = flight_dimensions(flight_ids, lock=True, skip_locked=True)
+    if set(locked) >= set(flight_ids):
+        transaction.savepoint_commit(savepoint)
+        return True
+    transaction.savepoint_rollback(savepoint)
+    return False
+
+
+def lock_flights_with_backoff(flight_ids):
+    """Try to lock the flights, backing off while another order has them.
+
+    After ``BOOKING_MAX_RETRIES`` retries, waiting
+    ``BOOKING_RETRY_BACKOFF`` seconds and twice as long every time, it
+    queues for the locks like the pessimistic strategy, so a hot flight
+    slows orders down instead of failing them.
+    """
+    retries = getattr(settings, "BOOKING_MAX_RETRIES", 3)
+    backoff = getattr(settings, "BOOKING_RETRY_BACKOFF", 0.05)
+    for attempt in range(retries + 1):
+        if try_lock_flights(flight_ids):
+            return
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+    lock_flights(flight_ids)
+
+
+def change_seats_remaining(deltas: dict):
+    """Apply per-flight seat deltas and drop cached views of the flights."""
+    for flight_id, delta in deltas.items():
+        if delta:
+            Flight.objects.filter(pk=flight_id).update(
+                seats_remaining=F("seats_remaining") + delta
+            )
+    if deltas:
+        invalidate_flights(Flight.objects.filter(pk__in=deltas))
+
+
+def release_holds(holds) -> int:
+    """Delete ``holds`` and give their seats back to the flights."""
+    with transaction.atomic():
+        lock_flights(holds.values("flight_id"))
+        released = list(
+            holds.select_for_update().values_list("id", "flight_id")
+        )
+        SeatHold.objects.filter(pk__in=[pk for pk, _ in released]).delete()
+        change_seats_remaining(
+            Counter(flight_id for _, flight_id in released)
+        )
+    return len(released)
+
+
+def cancel_tickets(tickets) -> int:
+    """Delete ``tickets`` and give their seats back to the flights.
+
+    The ``Ticket`` post_delete signals would update each flight once per
+    seat, so they stand aside while ``bulk_cancellation`` is set; the
+    counters, order summaries and cached views are updated here per
+    flight instead. Orders left without tickets are deleted as well.
+    """
+    with transaction.atomic():
+        lock_flights(tickets.values("flight_id"))
+        cancelled = list(
+            tickets.select_for_update(of=("self",)).values_list(
+                "id", "flight_id", "order_id"
+            )
+        )
+        if not cancelled:
+            return 0
+        token = bulk_cancellation.set(True)
+        try:
+            Ticket.objects.filter(
+                pk__in=[pk for pk, _, _ in cancelled]
+            ).delete()
+        finally:
+            bulk_cancellation.reset(token)
+        orders = Order.objects.filter(
+            pk__in={order_id for _, _, order_id in cancelled}
+        )
+        orders.filter(tickets__isnull=True).delete()
+        orders.refresh_summaries()
+        change_seats_remaining(
+            Counter(flight_id for _, flight_id, _ in cancelled)
+        )
+    return len(cancelled)
+
+
+def cancel_orders(orders) -> int:
+    """Delete ``orders`` with their tickets; the number of seats freed."""
+    with transaction.atomic():
+        cancelled = cancel_tickets(Ticket.objects.filter(order__in=orders))
+        orders.delete()
+    return cancelled
+
+
+def release_expired_holds(flight_ids=None) -> int:
+    holds = SeatHold.objects.expired()
+    if flight_ids is not None:
+        holds = holds.filter(flight_id__in=flight_ids)
+    return release_holds(holds)
+
+
+def hold_seats(user, flight_id: int, seats: list[dict]) -> list[SeatHold]:
+    """Reserve ``seats`` on one flight for ``SEAT_HOLD_TTL`` seconds.
+
+    Seats the user already holds get a fresh expiry; a seat sold or held
+    by somebody else fails the whole request with ``SeatConflict``.
+    """
+    requested = [(seat["row"], seat["seat"]) for seat in seats]
+    expires_at = timezone.now() + timedelta(
+        seconds=getattr(settings, "SEAT_HOLD_TTL", 600)
+    )
+
+    with transaction.atomic():
+        dimensions = lock_flights([flight_id])
+        errors = request_errors(
+            [{"flight": flight_id, **seat} for seat in seats], dimensions
+        )
+        if any(errors):
+            raise serializers.ValidationError({"seats": errors})
+
+        release_expired_holds([flight_id])
+        taken = taken_seats(flight_id, requested, user)
+        if taken:
+            raise SeatConflict(
+                [
+                    {
+                        "flight": flight_id,
+                        "row": row,
+                        "seat": seat,
+                        "reason": taken[(row, seat)],
+                    }
+                    for row, seat in requested
+                    if (row, seat) in taken
+                ],
+                PESSIMISTIC,
+            )
+
+        holds = SeatHold.objects.filter(
+            seats_filter(requested), flight_id=flight_id, user=user
+        )
+        renewed = set(holds.values_list("row", "seat"))
+        holds.update(expires_at=expires_at)
+        SeatHold.objects.bulk_create(
+            SeatHold(
+                flight_id=flight_id,
+                user=user,
+                row=row,
+                seat=seat,
+                expires_at=expires_at,
+            )
+            for row, seat in sorted(set(requested) - renewed)
+        )
+        change_seats_remaining({flight_id: len(renewed) - len(requested)})
+        return list(holds.order_by("row", "seat"))
+
+
+def nearest_free_seats(
+        flight_id: int, dimensions, user, wanted: list, keep: set
+) -> list:
+    """A free replacement for every seat in ``wanted``, closest first.
+
+    Seats in ``keep`` (the rest of the order) are never handed out.
+    """
+    rows, seats_in_row = dimensions
+    unavailable = set(taken_seats(flight_id, None, user)) | keep
+    free = {
+        (row, seat)
+        for row in range(1, rows + 1)
+        for seat in range(1, seats_in_row + 1)
+    } - unavailable
+    replacements = []
+    for row, seat in wanted:
+        if not free:
+            return []
+        best = min(
+            free,
+            key=lambda candidate: (
+                abs(candidate[0] - row), abs(candidate[1] - seat), candidate
+            ),
+        )
+        free.discard(best)
+        replacements.append(best)
+    return replacements
+
+
+def seat_conflicts(tickets, dimensions, user, allow_alternatives):
+    """Conflicting tickets, after moving them to free seats if allowed."""
+    conflicts = []
+    for flight_id in dimensions:
+        indexes = [
+            index for index, ticket in enumerate(tickets)
+            if ticket["flight"] == flight_id
+        ]
+        taken = taken_seats(
+            flight_id,
+            [(tickets[i]["row"], tickets[i]["seat"]) for i in indexes],
+            user,
+        )
+        clashing = [
+            i for i in indexes
+            if (tickets[i]["row"], tickets[i]["seat"]) in taken
+        ]
+        if clashing and allow_alternatives:
+            replacements = nearest_free_seats(
+                flight_id,
+                dimensions[flight_id],
+                user,
+                [(tickets[i]["row"], tickets[i]["seat"]) for i in clashing],
+                {
+                    (tickets[i]["row"], tickets[i]["seat"])
+                    for i in indexes if i not in clashing
+                },
+            )
+            for i, (row, seat) in zip(clashing, replacements):
+                tickets[i].update(row=row, seat=seat)
+            if replacements:
+                clashing = []
+        conflicts.extend(
+            {
+                "index": i,
+                **tickets[i],
+                "reason": taken[(tickets[i]["row"], tickets[i]["seat"])],
+            }
+            for i in clashing
+        )
+    return conflicts
+
+
+def group_errors(groups: list[dict], dimensions: dict) -> list[dict]:
+    errors = []
+    for group in groups:
+        size = dimensions.get(group["flight"])
+        if size is None:
+            error = {"flight": f"Flight {group['flight']} does not exist"}
+        elif group["count"] > size[0] * size[1]:
+            error = {"count": "count is larger than the airplane"}
+        else:
+            error = {}
+        errors.append(error)
+    return errors
+
+
+def assign_groups(groups, tickets, strategy) -> list[dict]:
+    """Seat every ``{"flight", "count"}`` group together.
+
+    Each flight's occupancy is read once into a ``SeatMap``; the seats of
+    ``tickets`` and of earlier groups are marked taken before the next
+    group is placed.
+    """
+    seat_maps = {}
+    assigned = []
+    for index, group in enumerate(groups):
+        flight_id = group["flight"]
+        if flight_id not in seat_maps:
+            seat_maps[flight_id] = SeatMap.from_database(flight_id)
+            for ticket in tickets:
+                if ticket["flight"] == flight_id:
+                    seat_maps[flight_id].take(ticket["row"], ticket["seat"])
+        seat_map = seat_maps[flight_id]
+
+        block = seat_map.find_block(group["count"])
+        if block is None:
+            raise SeatConflict(
+                [{"group": index, **group, "reason": NO_BLOCK}], strategy
+            )
+        for row, seat in block:
+            seat_map.take(row, seat)
+            assigned.append({"flight": flight_id, "row": row, "seat": seat})
+    return assigned
+
+
+def validate_order(
+        tickets: list[dict], groups: list[dict], dimensions=None
+):
+    """Reject unknown flights and seats outside the airplanes."""
+    if dimensions is None:
+        flight_ids = {ticket["flight"] for ticket in tickets}
+        flight_ids |= {group["flight"] for group in groups}
+        dimensions = airplane_dimensions.get_many(flight_ids)
+    errors = request_errors(tickets, dimensions)
+    if any(errors):
+        raise serializers.ValidationError({"tickets": errors})
+    errors = group_errors(groups, dimensions)
+    if any(errors):
+        raise serializers.ValidationError({"seat_groups": errors})
+
+
+def place_order(
+        user, tickets, groups, flight_ids, strategy, allow_alternatives
+):
+    if strategy == PESSIMISTIC:
+        dimensions = lock_flights(flight_ids)
+    else:
+        dimensions = airplane_dimensions.get_many(flight_ids)
+    validate_order(tickets, groups, dimensions)
+
+    if strategy == SKIP_LOCKED:
+        lock_flights_with_backoff(flight_ids)
+
+    release_expired_holds(flight_ids)
+    tickets = tickets + assign_groups(groups, tickets, strategy)
+    conflicts = seat_conflicts(tickets, dimensions, user, allow_alternatives)
+    if conflicts:
+        raise SeatConflict(conflicts, strategy)
+
+    # The user's own holds on these seats turn into tickets.
+    deltas = Counter()
+    for flight_id in flight_ids:
+        seats = [
+            (ticket["row"], ticket["seat"])
+            for ticket in tickets if ticket["flight"] == flight_id
+        ]
+        converted, _ = SeatHold.objects.filter(
+            seats_filter(seats), flight_id=flight_id, user=user
+        ).delete()
+        deltas[flight_id] = converted - len(seats)
+
+    order = Order.objects.create(user=user)
+    Ticket.objects.bulk_create(
+        Ticket(
+            order=order,
+            flight_id=ticket["flight"],
+            row=ticket["row"],
+            seat=ticket["seat"],
+        )
+        for ticket in sorted(tickets, key=seat_key)
+    )
+
+    # bulk_create skips the Ticket signals, so do their work here.
+    change_seats_remaining(deltas)
+    Order.objects.filter(pk=order.pk).refresh_summaries()
+    return order
+
+
+def book_tickets(
+        user, tickets: list[dict], allow_alternatives=False, groups=()
+) -> Order:
+    """Create an order with all ``tickets`` or none of them.
+
+    ``BOOKING_CONCURRENCY`` picks how concurrent orders are serialized:
+
+    * ``pessimistic`` locks the flights in id order and waits for them;
+    * ``skip_locked`` locks them too, but while another order holds a
+      flight it backs off and retries instead of queueing, and only
+      queues once the retries are used up, see
+      ``lock_flights_with_backoff``;
+    * ``optimistic`` takes no lock, relies on the unique seat constraint
+      and retries up to ``BOOKING_MAX_RETRIES`` times when it fires.
+
+    Each flight costs a fixed number of queries whatever the number of
+    seats. The user's own holds on the seats are converted. With
+    ``allow_alternatives`` taken seats are swapped for the closest free
+    ones; otherwise they fail the order with ``SeatConflict`` (409).
+    Every entry of ``groups`` asks for ``count`` seats on ``flight``
+    that the server picks together, see ``SeatMap.find_block``.
+    """
+    strategy = booking_strategy()
+    tickets = [dict(ticket) for ticket in tickets]
+    groups = [dict(group) for group in groups]
+    flight_ids = sorted(
+        {ticket["flight"] for ticket in tickets}
+        | {group["flight"] for group in groups}
+    )
+    attempts = 1
+    if strategy == OPTIMISTIC:
+        attempts += getattr(settings, "BOOKING_MAX_RETRIES", 3)
+
+    for _ in range(attempts):
+        try:
+            with transaction.atomic():
+                return place_order(
+                    user,
+                    tickets,
+                    groups,
+                    flight_ids,
+                    strategy,
+                    allow_alternatives,
+                )
+        except IntegrityError:
+            continue
+    raise SeatConflict(
+        [
+            {"index": index, **ticket, "reason": CONTENTION}
+            for index, ticket in enumerate(tickets)
+        ],
+        strategy,
+    )
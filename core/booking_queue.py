@@ -0,0 +1,213 @@
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from core.booking import book_tickets, validate_order
+from core.models import BookingRequest
+from core.serializers import BookingRequestSerializer
+
+logger = logging.getLogger(__name__)
+
+QUEUE_BATCH_SIZE = 50
+
+QUEUE_PARAMETERS = [
+    OpenApiParameter(
+        "Prefer",
+        type=str,
+        location=OpenApiParameter.HEADER,
+        description=(
+            "Send respond-async to queue the order instead of booking it "
+            "right away; the 202 response links to the queued request"
+        ),
+    ),
+]
+
+
+def enqueue_booking(user, order_data: dict) -> BookingRequest:
+    """Validate an order payload and store it for ``process_bookings``."""
+    payload = {
+        "tickets": order_data.get("tickets", []),
+        "seat_groups": order_data.get("seat_groups", []),
+        "allow_alternative_seats": order_data["allow_alternative_seats"],
+    }
+    validate_order(payload["tickets"], payload["seat_groups"])
+    flight_ids = [ticket["flight"] for ticket in payload["tickets"]]
+    flight_ids += [group["flight"] for group in payload["seat_groups"]]
+    return BookingRequest.objects.create(
+        user=user,
+        flight_id=min(flight_ids),
+        payload=payload,
+    )
+
+
+def prefers_async(request) -> bool:
+    """Whether the ``Prefer`` header asks for an asynchronous response."""
+    preferences = request.headers.get("Prefer", "")
+    return "respond-async" in {
+        preference.strip().lower() for preference in preferences.split(",")
+    }
+
+
+def requeue_stale(older_than: int) -> int:
+    """Hand requests of workers that died mid-batch back to the queue.
+
+    Requests a worker is booking right now stay locked by it and are
+    skipped, however old their claim is.
+    """
+    with transaction.atomic():
+        ids = list(
+            BookingRequest.objects.filter(
+                status=BookingRequest.PROCESSING,
+                claimed_at__lte=timezone.now() - timedelta(
+                    seconds=older_than
+                ),
+            )
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)
+        )
+        return BookingRequest.objects.filter(
+            pk__in=ids, status=BookingRequest.PROCESSING
+        ).update(status=BookingRequest.PENDING, claimed_at=None)
+
+
+def claim_batch(size: int = QUEUE_BATCH_SIZE) -> list[BookingRequest]:
+    """Claim up to ``size`` pending requests of the oldest queued flight.
+
+    Requests are locked with SKIP LOCKED, so several workers can drain
+    the queue side by side without claiming the same request twice.
+    Each claim is stamped with its ``claimed_at``, which the worker must
+    still own when it books the request, see ``process_request``.
+    """
+    with transaction.atomic():
+        pending = BookingRequest.objects.filter(
+            status=BookingRequest.PENDING
+        )
+        oldest = (
+            pending.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("flight_id", flat=True)
+            .first()
+        )
+        if oldest is None:
+            return []
+        ids = list(
+            pending.filter(flight_id=oldest)
+            .select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", flat=True)[:size]
+        )
+        claimed_at = timezone.now()
+        claimed = BookingRequest.objects.filter(
+            pk__in=ids, status=BookingRequest.PENDING
+        ).update(status=BookingRequest.PROCESSING, claimed_at=claimed_at)
+        if not claimed:
+            return []
+    return list(
+        BookingRequest.objects.filter(
+            pk__in=ids,
+            status=BookingRequest.PROCESSING,
+            claimed_at=claimed_at,
+        )
+        .select_related("user")
+        .order_by("id")
+    )
+
+
+def process_request(booking_request: BookingRequest) -> bool:
+    """Book a claimed request; False when the claim was lost meanwhile.
+
+    The request row stays locked while it is booked, and the claim is
+    checked under that lock, so a request that ``requeue_stale`` handed
+    to another worker is never booked twice.
+    """
+    claim = BookingRequest.objects.filter(
+        pk=booking_request.pk,
+        status=BookingRequest.PROCESSING,
+        claimed_at=booking_request.claimed_at,
+    )
+    with transaction.atomic():
+        if not claim.select_for_update().exists():
+            logger.warning(
+                "Booking request %s was claimed by another worker",
+                booking_request.id,
+            )
+            return False
+        payload = booking_request.payload
+        try:
+            with transaction.atomic():
+                order = book_tickets(
+                    booking_request.user,
+                    payload["tickets"],
+                    allow_alternatives=payload["allow_alternative_seats"],
+                    groups=payload["seat_groups"],
+                )
+        except APIException as error:
+            result = {
+                "status": BookingRequest.FAILED,
+                "status_code": error.status_code,
+                "result": error.detail,
+                "order": None,
+            }
+        except Exception:
+            logger.exception("Booking request %s failed", booking_request.id)
+            result = {
+                "status": BookingRequest.FAILED,
+                "status_code": 500,
+                "result": {"detail": "Booking failed."},
+                "order": None,
+            }
+        else:
+            result = {
+                "status": BookingRequest.SUCCEEDED,
+                "status_code": 201,
+                "result": None,
+                "order": order,
+            }
+        result["processed_at"] = timezone.now()
+        claim.update(**result)
+    for field, value in result.items():
+        setattr(booking_request, field, value)
+    return True
+
+
+def process_batch(size: int = QUEUE_BATCH_SIZE) -> int:
+    """Book one claimed batch in arrival order; the number processed."""
+    return sum(
+        process_request(booking_request)
+        for booking_request in claim_batch(size)
+    )
+
+
+class QueuedBookingMixin:
+    """Queue ``create`` when the client sends ``Prefer: respond-async``.
+
+    The order is validated up front and answered with 202 and the queued
+    request, whose status ``process_bookings`` fills in later.
+    """
+
+    def create(self, request, *args, **kwargs):
+        if not prefers_async(request):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        booking_request = enqueue_booking(
+            request.user, serializer.validated_data
+        )
+        location = reverse(
+            "core:bookingrequest-detail", args=[booking_request.id]
+        )
+        return Response(
+            BookingRequestSerializer(booking_request).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": request.build_absolute_uri(location),
+                "Preference-Applied": "respond-async",
+            },
+        )
@@ -0,0 +1,130 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.models import Airport, normalize_search_name
+
+GENERATION_KEY = "flights:gen:{}"
+SEARCH_KEY = "flights:search:{}"
+CALENDAR_KEY = "flights:calendar:{}:{}"
+AIRPORT_CODES_KEY = "airports:codes"
+AIRPORTS_SCOPE = "airports"
+NORMALIZED_PARAMS = ("departure_city", "arrival_city")
+
+
+def get_generations(scopes) -> dict:
+    """Current generation of every scope, creating missing counters."""
+    keys = {GENERATION_KEY.format(scope): scope for scope in scopes}
+    found = cache.get_many(keys)
+    missing = set(keys) - set(found)
+    if missing:
+        for key in missing:
+            cache.add(key, time.time_ns(), None)
+        found.update(cache.get_many(missing))
+    return {keys[key]: value for key, value in found.items()}
+
+
+def bump_generations(scopes):
+    for scope in set(scopes):
+        key = GENERATION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+def seat_map_scope(flight_id) -> str:
+    return f"seats:{flight_id}"
+
+
+def flight_scopes(
+        flight_id, route_id, departure_time, arrival_time
+) -> set[str]:
+    return {
+        "all",
+        seat_map_scope(flight_id),
+        f"route:{route_id}",
+        f"date:{departure_time.date().isoformat()}",
+        f"date:{arrival_time.date().isoformat()}",
+    }
+
+
+def invalidate_scopes(scopes):
+    """Bump the given scopes once the current transaction commits."""
+    scopes = set(scopes)
+    if scopes:
+        transaction.on_commit(lambda: bump_generations(scopes))
+
+
+def invalidate_flights(queryset):
+    scopes = set()
+    rows = queryset.values_list(
+        "id", "route_id", "departure_time", "arrival_time"
+    )
+    for row in rows:
+        scopes |= flight_scopes(*row)
+    invalidate_scopes(scopes)
+
+
+def search_cache_key(request) -> str:
+    params = []
+    for name in sorted(request.query_params):
+        for value in request.query_params.getlist(name):
+            if name in NORMALIZED_PARAMS:
+                value = normalize_search_name(value)
+            params.append((name, value.strip()))
+    raw = repr((request.get_host(), params))
+    return SEARCH_KEY.format(hashlib.sha1(raw.encode()).hexdigest())
+
+
+def get_cached(key: str):
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if get_generations(entry["generations"]) != entry["generations"]:
+        return None
+    return entry["data"]
+
+
+def set_cached(key: str, data, generations: dict, timeout=None):
+    if timeout is None:
+        timeout = getattr(settings, "FLIGHT_SEARCH_CACHE_TIMEOUT", 300)
+    cache.set(key, {"data": data, "generations": generations}, timeout)
+
+
+def get_cached_search(request):
+    return get_cached(search_cache_key(request))
+
+
+def set_cached_search(request, data, generations: dict):
+    set_cached(search_cache_key(request), data, generations)
+
+
+def calendar_cache_key(route_ids, month) -> str:
+    routes = ",".join(str(route_id) for route_id in sorted(route_ids))
+    return CALENDAR_KEY.format(routes, month.strftime("%Y-%m"))
+
+
+def airport_codes() -> dict[str, int]:
+    """Map every IATA and ICAO code to its airport id.
+
+    The map is cached under the ``airports`` scope, which the signals in
+    ``core.signals`` bump whenever an airport changes, so a code filter
+    costs cache reads instead of a query.
+    """
+    data = get_cached(AIRPORT_CODES_KEY)
+    if data is not None:
+        return data
+    generations = get_generations({AIRPORTS_SCOPE})
+    data = {}
+    for airport_id, iata_code, icao_code in Airport.objects.values_list(
+            "id", "iata_code", "icao_code"
+    ):
+        for code in (iata_code, icao_code):
+            if code:
+                data[code] = airport_id
+    set_cached(AIRPORT_CODES_KEY, data, generations)
+    return data
@@ -0,0 +1,207 @@
+import bisect
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Flight
+
+
+class Leg(NamedTuple):
+    flight_id: int
+    route_id: int
+    source_id: int
+    destination_id: int
+    departure_time: datetime
+    arrival_time: datetime
+    distance: int
+
+
+LEG_FIELDS = (
+    "id",
+    "route_id",
+    "route__source_id",
+    "route__destination_id",
+    "departure_time",
+    "arrival_time",
+    "route__distance",
+)
+
+
+class FlightGraph:
+    """In-memory adjacency of upcoming flights keyed by departure airport.
+
+    Every airport maps to its outgoing legs sorted by departure time, so
+    the next possible legs after a layover are found with a bisect instead
+    of a database query. The graph is loaded lazily with one query, kept
+    current by the signals in ``core.signals`` and fully reloaded after
+    ``CONNECTIONS_GRAPH_TTL`` seconds to pick up writes from other workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._legs: dict[int, Leg] = {}
+        self._departures: dict[int, list[tuple[datetime, int]]] = {}
+        self._loaded_at = None
+
+    def reset(self):
+        with self._lock:
+            self._legs = {}
+            self._departures = {}
+            self._loaded_at = None
+
+    def ensure_loaded(self):
+        ttl = getattr(settings, "CONNECTIONS_GRAPH_TTL", 300)
+        with self._lock:
+            if (
+                self._loaded_at is None
+                or time.monotonic() - self._loaded_at > ttl
+            ):
+                self._load()
+
+    def _load(self):
+        self._legs = {}
+        self._departures = {}
+        rows = Flight.objects.filter(
+            departure_time__gte=timezone.now()
+        ).values_list(*LEG_FIELDS)
+        for row in rows.iterator():
+            self._add(Leg(*row))
+        self._loaded_at = time.monotonic()
+
+    def _add(self, leg: Leg):
+        self._legs[leg.flight_id] = leg
+        bisect.insort(
+            self._departures.setdefault(leg.source_id, []),
+            (leg.departure_time, leg.flight_id),
+        )
+
+    def _remove(self, flight_id: int):
+        leg = self._legs.pop(flight_id, None)
+        if leg is None:
+            return
+        departures = self._departures[leg.source_id]
+        departures.remove((leg.departure_time, leg.flight_id))
+        if not departures:
+            del self._departures[leg.source_id]
+
+    def refresh_flights(self, flight_ids):
+        """Re-read the given flights once the current transaction commits.
+
+        Refreshing right away would put uncommitted rows in the graph and
+        keep them there if the transaction rolls back.
+        """
+        flight_ids = set(flight_ids)
+        transaction.on_commit(lambda: self._refresh_flights(flight_ids))
+
+    def refresh_route(self, route_id: int):
+        transaction.on_commit(lambda: self._refresh_route(route_id))
+
+    def remove_flight(self, flight_id: int):
+        transaction.on_commit(lambda: self._remove_flight(flight_id))
+
+    def _refresh_flights(self, flight_ids):
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for flight_id in flight_ids:
+                self._remove(flight_id)
+            rows = Flight.objects.filter(
+                id__in=flight_ids,
+                departure_time__gte=timezone.now(),
+            ).values_list(*LEG_FIELDS)
+            for row in rows:
+                self._add(Leg(*row))
+
+    def _refresh_route(self, route_id: int):
+        with self._lock:
+            self._refresh_flights({
+                leg.flight_id
+                for leg in self._legs.values()
+                if leg.route_id == route_id
+            })
+
+    def _remove_flight(self, flight_id: int):
+        with self._lock:
+            self._remove(flight_id)
+
+    def search(
+            self,
+            sources: set[int],
+            destinations: set[int],
+            departure_from: datetime,
+            departure_to: datetime,
+            max_legs: int,
+            min_layover: timedelta,
+            max_layover: timedelta,
+    ) -> list[tuple[Leg, ...]]:
+        self.ensure_loaded()
+        with self._lock:
+            itineraries = []
+            for source_id in sources:
+                for leg in self._legs_between(
+                        source_id, departure_from, departure_to
+                ):
+                    self._extend(
+                        (leg,),
+                        destinations,
+                        max_legs,
+                        min_layover,
+                        max_layover,
+                        itineraries,
+                    )
+            return itineraries
+
+    def _legs_between(self, airport_id, start, end):
+        departures = self._departures.get(airport_id, [])
+        index = bisect.bisect_left(departures, (start, 0))
+        while index < len(departures) and departures[index][0] < end:
+            yield self._legs[departures[index][1]]
+            index += 1
+
+    def _extend(
+            self,
+            path,
+            destinations,
+            max_legs,
+            min_layover,
+            max_layover,
+            itineraries,
+    ):
+        last = path[-1]
+        if last.destination_id in destinations:
+            itineraries.append(path)
+            return
+        if len(path) >= max_legs:
+            return
+        visited = {leg.source_id for leg in path}
+        for leg in self._legs_between(
+                last.destination_id,
+                last.arrival_time + min_layover,
+                last.arrival_time + max_layover + timedelta(microseconds=1),
+        ):
+            if leg.destination_id in visited:
+                continue
+            self._extend(
+                path + (leg,),
+                destinations,
+                max_legs,
+                min_layover,
+                max_layover,
+                itineraries,
+            )
+
+
+def itinerary_duration(legs) -> timedelta:
+    return legs[-1].arrival_time - legs[0].departure_time
+
+
+def itinerary_distance(legs) -> int:
+    return sum(leg.distance for leg in legs)
+
+
+flight_graph = FlightGraph()
@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from core.cache import get_generations, invalidate_scopes
+from core.models import Flight
+
+
+def dimensions_scope(flight_id) -> str:
+    return f"dimensions:{flight_id}"
+
+
+class AirplaneDimensionCache:
+    """Process-local map of flight id to its airplane ``(rows, seats)``.
+
+    Every entry is tagged with the generation of its flight's
+    ``dimensions:<id>`` scope in the cache; the signals in
+    ``core.signals`` bump it when that flight changes airplane or its
+    airplane is resized. As ``CACHES`` is shared by all processes, every
+    worker drops just that entry on the next lookup. At most
+    ``AIRPLANE_DIMENSIONS_CACHE_SIZE`` flights are kept, least recently
+    used first out. A lookup of many flights costs one cache read plus at
+    most one query for the flights not seen yet.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._dimensions: OrderedDict[int, tuple] = OrderedDict()
+
+    def reset(self):
+        with self._lock:
+            self._dimensions = OrderedDict()
+
+    def get(self, flight_id: int):
+        return self.get_many([flight_id]).get(flight_id)
+
+    def get_many(self, flight_ids) -> dict:
+        scopes = {
+            flight_id: dimensions_scope(flight_id)
+            for flight_id in set(flight_ids)
+        }
+        generations = get_generations(set(scopes.values()))
+        found = {}
+        with self._lock:
+            for flight_id, scope in scopes.items():
+                entry = self._dimensions.get(flight_id)
+                if entry is not None and entry[0] == generations[scope]:
+                    self._dimensions.move_to_end(flight_id)
+                    found[flight_id] = entry[1]
+            missing = set(scopes) - set(found)
+            if missing:
+                for flight_id, rows, seats_in_row in (
+                    Flight.objects.filter(pk__in=missing).values_list(
+                        "id", "airplane__rows", "airplane__seats_in_row"
+                    )
+                ):
+                    found[flight_id] = (rows, seats_in_row)
+                    self._dimensions[flight_id] = (
+                        generations[scopes[flight_id]], found[flight_id]
+                    )
+                    self._dimensions.move_to_end(flight_id)
+                max_size = getattr(
+                    settings, "AIRPLANE_DIMENSIONS_CACHE_SIZE", 10000
+                )
+                while len(self._dimensions) > max_size:
+                    self._dimensions.popitem(last=False)
+        return found
+
+    def invalidate(self, flight_ids):
+        flight_ids = set(flight_ids)
+        with self._lock:
+            for flight_id in flight_ids:
+                self._dimensions.pop(flight_id, None)
+        invalidate_scopes(
+            {dimensions_scope(flight_id) for flight_id in flight_ids}
+        )
+
+
+airplane_dimensions = AirplaneDimensionCache()
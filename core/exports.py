@@ -0,0 +1,123 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from core.models import Flight, Ticket
+
+EXPORT_CHUNK_SIZE = 2000
+
+SCHEDULE_COLUMNS = {
+    "flight_id": "id",
+    "departure_time": "departure_time",
+    "arrival_time": "arrival_time",
+    "source_airport": "route__source__name",
+    "source_city": "route__source__city__name",
+    "destination_airport": "route__destination__name",
+    "destination_city": "route__destination__city__name",
+    "distance": "route__distance",
+    "airplane": "airplane__name",
+    "tickets_available": "seats_remaining",
+}
+
+ORDER_COLUMNS = {
+    "order_id": "order_id",
+    "ordered_at": "order__create_at",
+    "user_id": "order__user_id",
+    "user_email": "order__user__email",
+    "ticket_id": "id",
+    "row": "row",
+    "seat": "seat",
+    "flight_id": "flight_id",
+    "departure_time": "flight__departure_time",
+    "arrival_time": "flight__arrival_time",
+    "source_airport": "flight__route__source__name",
+    "destination_airport": "flight__route__destination__name",
+}
+
+MANIFEST_COLUMNS = {
+    "ticket_id": "id",
+    "row": "row",
+    "seat": "seat",
+    "order_id": "order_id",
+    "email": "order__user__email",
+    "first_name": "order__user__first_name",
+    "last_name": "order__user__last_name",
+}
+
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class Echo:
+    """File-like object whose write() hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, columns: dict, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one dict per row, reading through a server-side cursor."""
+    rows = queryset.values_list(*columns.values()).iterator(
+        chunk_size=chunk_size
+    )
+    names = tuple(columns)
+    for row in rows:
+        yield dict(zip(names, row))
+
+
+def schedule_queryset(since, until=None):
+    queryset = Flight.objects.filter(departure_time__gte=since)
+    if until:
+        queryset = queryset.filter(departure_time__lt=until)
+    return queryset.order_by("departure_time", "id")
+
+
+def orders_queryset(since=None, until=None):
+    """Tickets of orders placed in ``[since, until)``, one row each."""
+    queryset = Ticket.objects.all()
+    if since:
+        queryset = queryset.filter(order__create_at__gte=since)
+    if until:
+        queryset = queryset.filter(order__create_at__lt=until)
+    return queryset.order_by("order__create_at", "order_id", "id")
+
+
+def manifest_queryset(flight_id: int):
+    """Tickets of one flight in seating order."""
+    return Ticket.objects.filter(flight_id=flight_id).order_by("row", "seat")
+
+
+def ndjson_lines(rows):
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + "\n"
+
+
+def csv_lines(rows, columns):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in row.values()
+        )
+
+
+def render_lines(rows, columns, output: str):
+    if output == "csv":
+        return csv_lines(rows, columns)
+    return ndjson_lines(rows)
+
+
+def streaming_export(rows, columns, output: str, name: str):
+    response = StreamingHttpResponse(
+        render_lines(rows, columns, output),
+        content_type=CONTENT_TYPES[output],
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{name}.{output}"'
+    )
+    return response
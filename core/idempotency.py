@@ -0,0 +1,148 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+IDEMPOTENCY_PARAMETERS = [
+    OpenApiParameter(
+        IDEMPOTENCY_HEADER,
+        type=str,
+        location=OpenApiParameter.HEADER,
+        description=(
+            "Client-chosen unique key; retries with the same key get the "
+            "first response back instead of creating another object"
+        ),
+    ),
+]
+
+
+def idempotency_ttl() -> int:
+    return getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 60 * 60)
+
+
+def idempotency_claim_timeout() -> int:
+    return getattr(settings, "IDEMPOTENCY_CLAIM_TIMEOUT", 10 * 60)
+
+
+def request_fingerprint(request) -> str:
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def key_expired(stored: IdempotencyKey) -> bool:
+    """Whether a stored key is past its TTL, or an abandoned claim."""
+    max_age = idempotency_ttl()
+    if stored.status_code is None:
+        max_age = min(max_age, idempotency_claim_timeout())
+    return stored.created_at <= timezone.now() - timedelta(seconds=max_age)
+
+
+def purge_expired_keys() -> int:
+    deleted, _ = IdempotencyKey.objects.expired(idempotency_ttl()).delete()
+    return deleted
+
+
+class IdempotentCreateMixin:
+    """Honor an ``Idempotency-Key`` header on ``create``.
+
+    The key is claimed per user before the object is created, so a retry
+    racing the first attempt gets a 409 instead of a second object. Once
+    the first attempt succeeds, its status and body are stored and later
+    retries are answered from them without running the view again; an
+    attempt that fails releases the key so it can be retried. Keys expire
+    after ``IDEMPOTENCY_KEY_TTL`` seconds; a claim whose attempt never
+    finished, because its worker died, is given up after
+    ``IDEMPOTENCY_CLAIM_TIMEOUT`` seconds.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field("key").max_length:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} is too long."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_fingerprint(request)
+        claimed = self.claim_idempotency_key(request.user, key, fingerprint)
+        if not isinstance(claimed, IdempotencyKey):
+            return claimed
+
+        try:
+            response = super().create(request, *args, **kwargs)
+        except Exception:
+            claimed.delete()
+            raise
+        if response.status_code >= 500:
+            claimed.delete()
+            return response
+        # A claim given up as abandoned meanwhile is simply not stored.
+        IdempotencyKey.objects.filter(
+            pk=claimed.pk, status_code__isnull=True
+        ).update(status_code=response.status_code, response=response.data)
+        return response
+
+    def claim_idempotency_key(self, user, key: str, fingerprint: str):
+        """The claimed key, or the response to send instead of creating."""
+        stored = IdempotencyKey.objects.filter(user=user, key=key).first()
+        if stored is not None and key_expired(stored):
+            # Only the attempt that still sees the same row deletes it.
+            IdempotencyKey.objects.filter(
+                pk=stored.pk, status_code=stored.status_code
+            ).delete()
+            stored = None
+        if stored is None:
+            try:
+                with transaction.atomic():
+                    return IdempotencyKey.objects.create(
+                        user=user, key=key, request_hash=fingerprint
+                    )
+            except IntegrityError:
+                stored = IdempotencyKey.objects.filter(
+                    user=user, key=key
+                ).first()
+                if stored is None:
+                    # The other claim was released in between; try again.
+                    return self.claim_idempotency_key(
+                        user, key, fingerprint
+                    )
+
+        if stored.request_hash != fingerprint:
+            return Response(
+                {
+                    "detail": (
+                        f"{IDEMPOTENCY_HEADER} was already used with a "
+                        "different request body."
+                    )
+                },
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        if stored.status_code is None:
+            return Response(
+                {
+                    "detail": (
+                        "A request with this "
+                        f"{IDEMPOTENCY_HEADER} is still in progress."
+                    )
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(
+            stored.response,
+            status=stored.status_code,
+            headers={REPLAYED_HEADER: "true"},
+        )
@@ -0,0 +1,90 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from core.benchmark import (
+    BenchmarkFixture,
+    compare_to_baseline,
+    run_benchmark,
+)
+from core.booking import STRATEGIES, booking_strategy
+
+
+class Command(BaseCommand):
+    help = (
+        "Books seats on one hot flight from concurrent workers and reports "
+        "throughput, latency, conflicts and a seat integrity check as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument(
+            "--orders",
+            type=int,
+            default=25,
+            help="Orders posted by every worker",
+        )
+        parser.add_argument("--seats-per-order", type=int, default=2)
+        parser.add_argument("--rows", type=int, default=20)
+        parser.add_argument("--seats-in-row", type=int, default=6)
+        parser.add_argument(
+            "--mode",
+            choices=("thread", "process"),
+            default="thread",
+        )
+        parser.add_argument(
+            "--strategy",
+            choices=STRATEGIES,
+            help="Override BOOKING_CONCURRENCY for this run",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            help="Write the JSON report to this file instead of stdout",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Earlier JSON report to compare this run against",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the benchmark flight, users and orders",
+        )
+
+    def handle(self, *args, **options):
+        fixture = BenchmarkFixture(
+            options["rows"], options["seats_in_row"], options["workers"]
+        )
+        strategy = options["strategy"] or booking_strategy()
+        try:
+            with override_settings(BOOKING_CONCURRENCY=strategy):
+                report = run_benchmark(
+                    fixture.flight.id,
+                    [user.id for user in fixture.users],
+                    options["orders"],
+                    options["seats_per_order"],
+                    mode=options["mode"],
+                    seed=options["seed"],
+                )
+        finally:
+            if not options["keep"]:
+                fixture.delete()
+
+        if options["baseline"]:
+            with open(options["baseline"]) as file:
+                baseline = json.load(file)
+            report["change"] = compare_to_baseline(report, baseline)
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        if not report["integrity"]["ok"]:
+            raise CommandError(
+                f"Seat integrity check failed: {report['integrity']}"
+            )
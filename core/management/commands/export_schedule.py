@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core.exports import (
+    EXPORT_CHUNK_SIZE,
+    SCHEDULE_COLUMNS,
+    export_rows,
+    render_lines,
+    schedule_queryset,
+)
+
+
+def aware_datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise CommandError(f"Invalid datetime: {value}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = "Streams the forward flight schedule as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=aware_datetime,
+            help="First departure time to export (default: now)",
+        )
+        parser.add_argument(
+            "--until",
+            type=aware_datetime,
+            help="Export departures before this time",
+        )
+        parser.add_argument(
+            "--output",
+            choices=("ndjson", "csv"),
+            default="ndjson",
+        )
+        parser.add_argument(
+            "--file",
+            help="Write to this file instead of stdout",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        rows = export_rows(
+            schedule_queryset(
+                options["since"] or timezone.now(),
+                options["until"],
+            ),
+            SCHEDULE_COLUMNS,
+            chunk_size=options["chunk_size"],
+        )
+        lines = render_lines(rows, SCHEDULE_COLUMNS, options["output"])
+        if options["file"]:
+            with open(options["file"], "w", newline="") as file:
+                file.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.boarding_passes import IMAGE_FORMATS, generate_boarding_passes
+from core.models import Flight
+
+
+class Command(BaseCommand):
+    help = "Renders boarding passes for every ticket of the given flights"
+
+    def add_arguments(self, parser):
+        parser.add_argument("flight_ids", nargs="+", type=int)
+        parser.add_argument(
+            "--output",
+            choices=tuple(IMAGE_FORMATS),
+            default="png",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Rendering processes (default: one per CPU)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Render passes again even if they are already on disk",
+        )
+
+    def handle(self, *args, **options):
+        generated = 0
+        for flight_id in options["flight_ids"]:
+            try:
+                generated += generate_boarding_passes(
+                    flight_id,
+                    output=options["output"],
+                    workers=options["workers"],
+                    force=options["force"],
+                )
+            except Flight.DoesNotExist as error:
+                raise CommandError(str(error))
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {generated} boarding pass(es)")
+        )
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.booking_queue import (
+    QUEUE_BATCH_SIZE,
+    process_batch,
+    requeue_stale,
+)
+
+
+class Command(BaseCommand):
+    help = "Books orders queued with 'Prefer: respond-async'"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=QUEUE_BATCH_SIZE,
+            help="Requests claimed per batch (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling for more",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=1.0,
+            help="Seconds to wait when the queue is empty (default: 1)",
+        )
+        parser.add_argument(
+            "--requeue-after",
+            type=int,
+            default=300,
+            help=(
+                "Requeue requests claimed more than this many seconds ago "
+                "by a worker that never finished them (default: 300)"
+            ),
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        try:
+            while True:
+                requeue_stale(options["requeue_after"])
+                count = process_batch(options["batch_size"])
+                processed += count
+                if count:
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {processed} booking request(s)")
+        )
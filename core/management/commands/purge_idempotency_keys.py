@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = "Deletes idempotency keys older than IDEMPOTENCY_KEY_TTL"
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired key(s)")
+        )
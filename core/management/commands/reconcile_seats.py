@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Flight
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the stored seats_remaining counter of flights"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "flight_ids",
+            nargs="*",
+            type=int,
+            help="Only reconcile these flights (default: all flights)",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Flight.objects.all()
+        if options["flight_ids"]:
+            queryset = queryset.filter(pk__in=options["flight_ids"])
+        updated = queryset.reconcile_seats()
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled seats for {updated} flight(s)")
+        )
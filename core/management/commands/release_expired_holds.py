@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from core.booking import release_expired_holds
+
+
+class Command(BaseCommand):
+    help = (
+        "Releases expired seat holds and returns their seats to the flights"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "flight_ids",
+            nargs="*",
+            type=int,
+            help="Only sweep holds on these flights (default: all flights)",
+        )
+
+    def handle(self, *args, **options):
+        released = release_expired_holds(options["flight_ids"] or None)
+        self.stdout.write(
+            self.style.SUCCESS(f"Released {released} expired hold(s)")
+        )
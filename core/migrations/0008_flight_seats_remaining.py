@@ -0,0 +1,43 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:59
+
+from django.db import migrations, models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_seats_remaining(apps, schema_editor):
+    Flight = apps.get_model("core", "Flight")
+    Airplane = apps.get_model("core", "Airplane")
+    Ticket = apps.get_model("core", "Ticket")
+
+    capacity = Airplane.objects.filter(
+        pk=OuterRef("airplane_id")
+    ).annotate(
+        capacity=F("rows") * F("seats_in_row")
+    ).values("capacity")
+    sold = Ticket.objects.filter(
+        flight=OuterRef("pk")
+    ).order_by().values("flight").annotate(
+        sold=Count("id")
+    ).values("sold")
+    Flight.objects.update(
+        seats_remaining=Subquery(capacity) - Coalesce(Subquery(sold), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_alter_airplane_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="seats_remaining",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            fill_seats_remaining, migrations.RunPython.noop
+        ),
+    ]
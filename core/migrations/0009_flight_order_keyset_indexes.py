@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_flight_seats_remaining"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="flight",
+            index=models.Index(
+                fields=["departure_time", "id"],
+                name="flight_departure_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["create_at", "id"], name="order_create_at_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.5 on 2026-10-17 07:10
+
+from django.db import migrations, models
+
+import core.models
+
+
+TRIGRAM_INDEXES = (
+    ("core_airport", "core_airport_search_name_trgm"),
+    ("core_city", "core_city_search_name_trgm"),
+)
+
+
+def fill_search_name(apps, schema_editor):
+    for model_name in ("Airport", "City"):
+        model = apps.get_model("core", model_name)
+        objects = list(model.objects.only("id", "name"))
+        for obj in objects:
+            obj.search_name = core.models.normalize_search_name(obj.name)
+        model.objects.bulk_update(objects, ["search_name"])
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, index in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index} "
+            f"ON {table} USING gin (search_name gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for _, index in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_flight_order_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airport",
+            name="search_name",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=255
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="search_name",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=255
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-17 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Left
+
+
+def fill_order_summaries(apps, schema_editor):
+    Order = apps.get_model("core", "Order")
+    Ticket = apps.get_model("core", "Ticket")
+
+    tickets = Ticket.objects.filter(order=OuterRef("pk"))
+    count = tickets.order_by().values("order").annotate(
+        count=Count("id")
+    ).values("count")
+    first = tickets.order_by("flight__departure_time", "id")
+    label = first.annotate(
+        label=Left(
+            Concat(
+                "flight__route__source__name",
+                Value(" -> "),
+                "flight__route__destination__name",
+            ),
+            255,
+        )
+    ).values("label")
+    Order.objects.update(
+        ticket_count=Coalesce(Subquery(count), 0),
+        first_departure=Subquery(
+            first.values("flight__departure_time")[:1]
+        ),
+        route_label=Coalesce(Subquery(label[:1]), Value("")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_bookingrequest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="ticket_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="first_departure",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="route_label",
+            field=models.CharField(
+                blank=True, editable=False, max_length=255
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "-create_at", "-id"],
+                name="order_user_create_at_idx",
+            ),
+        ),
+        migrations.RunPython(
+            fill_order_summaries, migrations.RunPython.noop
+        ),
+    ]
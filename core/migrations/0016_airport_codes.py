@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-17 11:45
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_order_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airport",
+            name="iata_code",
+            field=models.CharField(
+                blank=True,
+                max_length=3,
+                null=True,
+                unique=True,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        "^[A-Z]{3}\\Z",
+                        "IATA code must be 3 uppercase letters",
+                    )
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="airport",
+            name="icao_code",
+            field=models.CharField(
+                blank=True,
+                max_length=4,
+                null=True,
+                unique=True,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        "^[A-Z]{4}\\Z",
+                        "ICAO code must be 4 uppercase letters",
+                    )
+                ],
+            ),
+        ),
+    ]
@@ -1,18 +1,79 @@
 import pathlib
+import unicodedata
 import uuid
-
-from django.db import models
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import RegexValidator
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Left, Now
+from django.utils import timezone
 from django.utils.text import slugify
 
 from flight_booking import settings
 
 
+class FlightQuerySet(models.QuerySet):
+    def reconcile_seats(self) -> int:
+        """Rebuild ``seats_remaining`` from capacity, tickets and holds."""
+        capacity = Airplane.objects.filter(
+            pk=OuterRef("airplane_id")
+        ).annotate(
+            capacity=F("rows") * F("seats_in_row")
+        ).values("capacity")
+        sold = Ticket.objects.filter(
+            flight=OuterRef("pk")
+        ).order_by().values("flight").annotate(
+            sold=Count("id")
+        ).values("sold")
+        held = SeatHold.objects.filter(
+            flight=OuterRef("pk")
+        ).order_by().values("flight").annotate(
+            held=Count("id")
+        ).values("held")
+        return self.update(
+            seats_remaining=(
+                Subquery(capacity)
+                - Coalesce(Subquery(sold), 0)
+                - Coalesce(Subquery(held), 0)
+            )
+        )
+
+
 class Flight(models.Model):
     route = models.ForeignKey("Route", on_delete=models.PROTECT)
     airplane = models.ForeignKey("Airplane", on_delete=models.PROTECT)
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crews = models.ManyToManyField("Crew", related_name="flights")
+    seats_remaining = models.IntegerField(default=0, editable=False)
+
+    objects = FlightQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["departure_time", "id"],
+                name="flight_departure_id_idx",
+            ),
+            models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx",
+            ),
+            models.Index(
+                fields=["arrival_time"],
+                name="flight_arrival_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            self.seats_remaining = (
+                self.airplane.rows * self.airplane.seats_in_row
+            )
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return (
@@ -76,16 +137,19 @@ class Ticket(models.Model):
             )
 
     def check_constraints(self, error_cls):
-        airplane = self.flight.airplane
+        # Imported here because the dimension cache itself queries Flight.
+        from core.dimensions import airplane_dimensions
+
+        rows, seats_in_row = airplane_dimensions.get(self.flight_id)
         Ticket.validate_value(
             self.seat,
-            airplane.seats_in_row,
+            seats_in_row,
             "seat",
             error_cls
         )
         Ticket.validate_value(
             self.row,
-            airplane.rows,
+            rows,
             "row",
             error_cls
         )
@@ -93,21 +157,197 @@ class Ticket(models.Model):
     def clean(self):
         self.check_constraints(ValueError)
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return f"Ticket {self.row}{self.seat} for {self.flight}"
 
 
+ROUTE_LABEL_LENGTH = 255
+
+
+class OrderQuerySet(models.QuerySet):
+    def refresh_summaries(self) -> int:
+        """Rebuild ticket count, first departure and route of orders."""
+        tickets = Ticket.objects.filter(order=OuterRef("pk"))
+        count = tickets.order_by().values("order").annotate(
+            count=Count("id")
+        ).values("count")
+        first = tickets.order_by("flight__departure_time", "id")
+        label = first.annotate(
+            label=Left(
+                Concat(
+                    "flight__route__source__name",
+                    Value(" -> "),
+                    "flight__route__destination__name",
+                ),
+                ROUTE_LABEL_LENGTH,
+            )
+        ).values("label")
+        return self.update(
+            ticket_count=Coalesce(Subquery(count), 0),
+            first_departure=Subquery(
+                first.values("flight__departure_time")[:1]
+            ),
+            route_label=Coalesce(Subquery(label[:1]), Value("")),
+        )
+
+
 class Order(models.Model):
     create_at = models.DateTimeField(auto_now_add=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
+    # Summary of the tickets for order lists, kept up to date by
+    # ``refresh_summaries`` whenever tickets or their flights change.
+    ticket_count = models.PositiveIntegerField(default=0, editable=False)
+    first_departure = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False
+    )
+    route_label = models.CharField(
+        max_length=ROUTE_LABEL_LENGTH,
+        blank=True,
+        editable=False
+    )
+
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["create_at", "id"],
+                name="order_create_at_id_idx",
+            ),
+            models.Index(
+                fields=["user", "-create_at", "-id"],
+                name="order_user_create_at_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Order {self.id} by {self.user} on {self.create_at}"
 
 
+class SeatHoldQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(expires_at__gt=Now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=Now())
+
+
+class SeatHold(models.Model):
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="holds"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="seat_holds"
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    objects = SeatHoldQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("flight", "row", "seat",)
+
+    def __str__(self):
+        return (
+            f"Hold {self.row}{self.seat} for {self.flight} "
+            f"until {self.expires_at}"
+        )
+
+
+class BookingRequest(models.Model):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (PROCESSING, "Processing"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="booking_requests"
+    )
+    flight = models.ForeignKey(
+        Flight,
+        on_delete=models.CASCADE,
+        related_name="booking_requests"
+    )
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING
+    )
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+"
+    )
+    status_code = models.PositiveSmallIntegerField(null=True)
+    result = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    claimed_at = models.DateTimeField(null=True)
+    processed_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "flight", "id"],
+                name="booking_request_queue_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Booking request {self.id} by {self.user}: {self.status}"
+
+
+class IdempotencyKeyQuerySet(models.QuerySet):
+    def expired(self, ttl: int):
+        return self.filter(
+            created_at__lte=timezone.now() - timedelta(seconds=ttl)
+        )
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys"
+    )
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = IdempotencyKeyQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("user", "key",)
+
+    def __str__(self):
+        return f"Idempotency key {self.key} of {self.user}"
+
+
 def airplane_image_path(instance: "Airplane", filename: str) -> pathlib.Path:
     filename = (
             f"{slugify(instance.name)}--{uuid.uuid4()}"
@@ -162,9 +402,57 @@ class Route(models.Model):
         )
 
 
+def normalize_search_name(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value.strip().casefold())
+    return "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+
+
+class SearchNameQuerySet(models.QuerySet):
+    def search(self, text: str):
+        return self.filter(search_name__contains=normalize_search_name(text))
+
+
 class Airport(models.Model):
     name = models.CharField(max_length=255, unique=True)
     city = models.ForeignKey("City", on_delete=models.PROTECT)
+    search_name = models.CharField(
+        max_length=255,
+        db_index=True,
+        editable=False
+    )
+    iata_code = models.CharField(
+        max_length=3,
+        unique=True,
+        null=True,
+        blank=True,
+        validators=[
+            RegexValidator(
+                r"^[A-Z]{3}\Z", "IATA code must be 3 uppercase letters"
+            )
+        ],
+    )
+    icao_code = models.CharField(
+        max_length=4,
+        unique=True,
+        null=True,
+        blank=True,
+        validators=[
+            RegexValidator(
+                r"^[A-Z]{4}\Z", "ICAO code must be 4 uppercase letters"
+            )
+        ],
+    )
+
+    objects = SearchNameQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        self.search_name = normalize_search_name(self.name)
+        # Blank codes are stored as NULL so they don't clash as duplicates.
+        self.iata_code = self.iata_code or None
+        self.icao_code = self.icao_code or None
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -173,6 +461,17 @@ class Airport(models.Model):
 class City(models.Model):
     name = models.CharField(max_length=255, unique=True)
     country = models.ForeignKey("Country", on_delete=models.PROTECT)
+    search_name = models.CharField(
+        max_length=255,
+        db_index=True,
+        editable=False
+    )
+
+    objects = SearchNameQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        self.search_name = normalize_search_name(self.name)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -0,0 +1,41 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class FlightKeysetPagination(KeysetPagination):
+    ordering = ("departure_time", "id")
+
+
+class TicketKeysetPagination(KeysetPagination):
+    ordering = ("id",)
+
+
+class OrderKeysetPagination(KeysetPagination):
+    ordering = ("-create_at", "-id")
+
+
+class KeysetPaginationMixin:
+    """Switch a viewset to keyset pagination on ``?pagination=cursor``.
+
+    Page-number pagination stays the default; a request carrying a
+    ``cursor`` (taken from a previous keyset page) keeps keyset mode.
+    """
+
+    keyset_pagination_class = None
+
+    def use_keyset_pagination(self) -> bool:
+        params = self.request.query_params
+        return bool(self.keyset_pagination_class) and (
+            params.get("pagination") == "cursor" or "cursor" in params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and self.use_keyset_pagination():
+            self._paginator = self.keyset_pagination_class()
+        return super().paginator
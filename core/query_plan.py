@@ -0,0 +1,223 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_field_list(value) -> set[str]:
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+logger = logging.getLogger(__name__)
+
+
+def join_path(prefix: str, name: str) -> str:
+    return f"{prefix}__{name}" if prefix else name
+
+
+def prune_fields(serializer, request):
+    """Drop fields not selected by ``?fields=`` or listed in ``?omit=``."""
+    if request is None or request.method not in SAFE_METHODS:
+        return
+    include = parse_field_list(request.query_params.get("fields"))
+    omit = parse_field_list(request.query_params.get("omit"))
+    for name in list(serializer.fields):
+        if (include and name not in include) or name in omit:
+            serializer.fields.pop(name)
+
+
+class QueryPlan:
+    """Joins, prefetches and columns one serializer needs from one model.
+
+    ``select_related`` and ``only`` are lookups relative to ``model``;
+    every to-many relation gets its own nested plan that is applied to
+    the queryset of a ``Prefetch``.
+    """
+
+    def __init__(self, model, annotations=()):
+        self.model = model
+        self.annotations = set(annotations)
+        self.select_related = set()
+        self.only = {model._meta.pk.name}
+        self.prefetches = {}
+
+    def add_serializer(self, serializer, prefix="", model=None):
+        model = model or self.model
+        hints = getattr(serializer, "field_sources", {})
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source == "*":
+                sources = hints.get(name)
+                if sources is None and not isinstance(
+                        field, serializers.BaseSerializer
+                ):
+                    self._add_all_columns(prefix, model)
+                    continue
+                for source in sources or ():
+                    self._add_source(source.split("."), prefix, model, None)
+                if isinstance(field, serializers.BaseSerializer):
+                    self.add_serializer(field, prefix, model)
+                continue
+            self._add_source(field.source_attrs, prefix, model, field)
+
+    def _add_source(self, attrs, prefix, model, field):
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                if not (prefix == "" and attr in self.annotations):
+                    self._add_all_columns(prefix, model)
+                return
+            path = join_path(prefix, model_field.name)
+            rest = attrs[index + 1:]
+
+            if not model_field.is_relation:
+                self.only.add(path)
+                return
+
+            if model_field.one_to_many or model_field.many_to_many:
+                child = self._prefetch_plan(path, model_field)
+                child._add_field_rest(rest, field)
+                return
+
+            if not rest and isinstance(field, serializers.RelatedField):
+                self._add_related_field(
+                    path, field, model_field.related_model, join=True
+                )
+                return
+
+            self.select_related.add(path)
+            self.only.add(path)
+            prefix, model = path, model_field.related_model
+
+        self._add_field_rest([], field, prefix, model)
+
+    def _add_field_rest(self, rest, field, prefix="", model=None):
+        """Finish a source that ended on ``model`` (or continues in it)."""
+        model = model or self.model
+        if rest:
+            self._add_source(rest, prefix, model, field)
+        elif isinstance(field, serializers.ListSerializer):
+            self.add_serializer(field.child, prefix, model)
+        elif isinstance(field, serializers.BaseSerializer):
+            self.add_serializer(field, prefix, model)
+        elif isinstance(field, serializers.ManyRelatedField):
+            self._add_related_field(prefix, field.child_relation, model)
+        elif isinstance(field, serializers.RelatedField):
+            self._add_related_field(prefix, field, model)
+        else:
+            self._add_all_columns(prefix, model)
+
+    def _add_related_field(self, path, field, related_model, join=False):
+        """Columns for a relational field pointing at ``related_model``.
+
+        With ``join`` the field reaches the related row through the
+        forward relation ``path``; otherwise ``path`` already is the
+        related row (the root of a prefetch).
+        """
+        if isinstance(field, serializers.SlugRelatedField):
+            slug_path = join_path(path, field.slug_field)
+            if join:
+                self.select_related.add(path)
+                self.only.add(path)
+            self.only.add(slug_path)
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            if join:
+                self.only.add(path)
+        else:
+            if join:
+                self.select_related.add(path)
+                self.only.add(path)
+            self._add_all_columns(path, related_model)
+
+    def _prefetch_plan(self, path, model_field):
+        if path not in self.prefetches:
+            child = QueryPlan(model_field.related_model)
+            if model_field.one_to_many:
+                child.only.add(model_field.field.name)
+            self.prefetches[path] = child
+        return self.prefetches[path]
+
+    def _add_all_columns(self, prefix, model):
+        for model_field in model._meta.concrete_fields:
+            self.only.add(join_path(prefix, model_field.name))
+
+    def report(self) -> dict:
+        return {
+            "model": self.model._meta.label,
+            "select_related": sorted(self.select_related),
+            "only": sorted(self.only),
+            "prefetch": {
+                lookup: child.report()
+                for lookup, child in sorted(self.prefetches.items())
+            },
+        }
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        for lookup, child in sorted(self.prefetches.items()):
+            queryset = queryset.prefetch_related(Prefetch(
+                lookup,
+                queryset=child.apply(child.model._default_manager.all()),
+            ))
+        return queryset.only(*sorted(self.only))
+
+
+class QueryPlanMixin:
+    """Derive the queryset shape of read actions from their serializer.
+
+    ``filter_queryset`` applies a ``QueryPlan`` built from the active
+    serializer, so viewsets only filter and annotate in ``get_queryset``.
+    Method fields declare what they read through the serializer's
+    ``field_sources``. With ``QUERY_PLAN_DEBUG`` on, the chosen plan is
+    returned in the ``X-Query-Plan`` response header.
+    """
+
+    planned_actions = ("list", "retrieve")
+
+    def get_serializer_fields(self) -> set[str]:
+        return set(self.get_serializer().fields)
+
+    def get_query_plan(self, queryset) -> QueryPlan:
+        plan = QueryPlan(queryset.model, queryset.query.annotations)
+        plan.add_serializer(self.get_serializer())
+        return plan
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in self.planned_actions:
+            return queryset
+        plan = self.get_query_plan(queryset)
+        self.query_plan = plan
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s.%s query plan: %s",
+                type(self).__name__,
+                self.action,
+                plan.report(),
+            )
+        return plan.apply(queryset)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        plan = getattr(self, "query_plan", None)
+        if plan is not None and getattr(settings, "QUERY_PLAN_DEBUG", False):
+            response["X-Query-Plan"] = json.dumps(plan.report())
+        return response
+
+
+class SparseFieldsetMixin(QueryPlanMixin):
+    """``?fields=``/``?omit=`` support that also prunes the SQL."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        prune_fields(getattr(serializer, "child", serializer), self.request)
+        return serializer
@@ -0,0 +1,164 @@
+import base64
+import math
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.cache import (
+    get_cached,
+    get_generations,
+    seat_map_scope,
+    set_cached,
+)
+from core.models import Flight, SeatHold, Ticket
+
+SEAT_MAP_KEY = "flights:seatmap:{}"
+
+
+class SeatMap:
+    """Occupancy of one flight as a packed bitset.
+
+    Seat ``(row, seat)`` is bit ``(row - 1) * seats_in_row + seat - 1``;
+    bit ``i`` lives in byte ``i // 8`` at position ``i % 8`` (LSB first).
+    A set bit means the seat is sold or held.
+    """
+
+    def __init__(self, rows: int, seats_in_row: int, bits=None):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.bits = bytearray(bits or (rows * seats_in_row + 7) // 8)
+        self.holds_expire_at = None
+
+    def index(self, row: int, seat: int) -> int:
+        return (row - 1) * self.seats_in_row + seat - 1
+
+    def is_taken(self, row: int, seat: int) -> bool:
+        index = self.index(row, seat)
+        return bool(self.bits[index // 8] & (1 << index % 8))
+
+    def take(self, row: int, seat: int):
+        index = self.index(row, seat)
+        self.bits[index // 8] |= 1 << index % 8
+
+    def release(self, row: int, seat: int):
+        index = self.index(row, seat)
+        self.bits[index // 8] &= ~(1 << index % 8)
+
+    @property
+    def capacity(self) -> int:
+        return self.rows * self.seats_in_row
+
+    @property
+    def taken_count(self) -> int:
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def taken_seats(self) -> dict:
+        seats = {}
+        for row in range(1, self.rows + 1):
+            taken = [
+                seat
+                for seat in range(1, self.seats_in_row + 1)
+                if self.is_taken(row, seat)
+            ]
+            if taken:
+                seats[row] = taken
+        return seats
+
+    def find_block(self, count: int):
+        """Best free seats for a group of ``count`` sitting together.
+
+        The first row with ``count`` adjacent free seats wins; otherwise
+        the fewest adjacent rows holding ``count`` free seats, front first,
+        starting with a single row whose free seats are split.
+        Rows are scanned as bit masks, so a run of free seats is found by
+        AND-ing the row mask with itself shifted, not seat by seat.
+        """
+        full = (1 << self.seats_in_row) - 1
+        taken = int.from_bytes(self.bits, "little")
+        free = [
+            ~(taken >> (row * self.seats_in_row)) & full
+            for row in range(self.rows)
+        ]
+
+        if count <= self.seats_in_row:
+            for row, mask in enumerate(free):
+                run = mask
+                for shift in range(1, count):
+                    run &= mask >> shift
+                if run:
+                    start = (run & -run).bit_length() - 1
+                    return [
+                        (row + 1, start + offset + 1)
+                        for offset in range(count)
+                    ]
+
+        free_counts = [mask.bit_count() for mask in free]
+        for span in range(1, self.rows + 1):
+            window = sum(free_counts[:span - 1])
+            for first in range(self.rows - span + 1):
+                window += free_counts[first + span - 1]
+                if window >= count:
+                    seats = [
+                        (row + 1, seat + 1)
+                        for row in range(first, first + span)
+                        for seat in range(self.seats_in_row)
+                        if free[row] >> seat & 1
+                    ]
+                    return seats[:count]
+                window -= free_counts[first]
+        return None
+
+    def to_base64(self) -> str:
+        return base64.b64encode(bytes(self.bits)).decode()
+
+    @classmethod
+    def from_database(cls, flight_id: int) -> "SeatMap":
+        rows, seats_in_row = Flight.objects.values_list(
+            "airplane__rows", "airplane__seats_in_row"
+        ).get(pk=flight_id)
+        seat_map = cls(rows, seats_in_row)
+        # Seats sold before the airplane shrank have no bit to set.
+        on_board = {
+            "flight_id": flight_id,
+            "row__lte": rows,
+            "seat__lte": seats_in_row,
+        }
+        taken = Ticket.objects.filter(**on_board).values_list("row", "seat")
+        for row, seat in taken:
+            seat_map.take(row, seat)
+        held = SeatHold.objects.active().filter(
+            **on_board
+        ).values_list("row", "seat", "expires_at")
+        for row, seat, expires_at in held:
+            seat_map.take(row, seat)
+            if seat_map.holds_expire_at is None:
+                seat_map.holds_expire_at = expires_at
+            else:
+                seat_map.holds_expire_at = min(
+                    seat_map.holds_expire_at, expires_at
+                )
+        return seat_map
+
+
+def get_seat_map(flight_id: int) -> SeatMap:
+    """Cached seat map, rebuilt from three small queries after a change."""
+    key = SEAT_MAP_KEY.format(flight_id)
+    data = get_cached(key)
+    if data is not None:
+        return SeatMap(*data)
+    generations = get_generations({seat_map_scope(flight_id)})
+    seat_map = SeatMap.from_database(flight_id)
+    timeout = getattr(settings, "SEAT_MAP_CACHE_TIMEOUT", 300)
+    if seat_map.holds_expire_at is not None:
+        # Expiring holds free seats without a write, so cache no longer.
+        until_expiry = seat_map.holds_expire_at - timezone.now()
+        timeout = max(
+            1, min(timeout, math.ceil(until_expiry.total_seconds()))
+        )
+    set_cached(
+        key,
+        (seat_map.rows, seat_map.seats_in_row, bytes(seat_map.bits)),
+        generations,
+        timeout=timeout,
+    )
+    return seat_map
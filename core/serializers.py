@@ -1,5 +1,8 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
+from core.booking import book_tickets
+from core.seatmap import get_seat_map
 from core.models import (
     Flight,
     Crew,
@@ -11,7 +14,9 @@ from core.models import (
     Route,
     Airport,
     City,
-    Country
+    Country,
+    SeatHold,
+    BookingRequest,
 )
 
 
@@ -86,14 +91,6 @@ class TicketCreateSerializer(serializers.ModelSerializer):
         model = Ticket
         fields = ("id", "flight", "row", "seat", "source", "destination")
 
-    def validate(self, attrs):
-        Ticket(
-            row=attrs["row"],
-            seat=attrs["seat"],
-            flight=attrs["flight"],
-        ).check_constraints(serializers.ValidationError)
-        return attrs
-
 
 class OrderSerializer(serializers.ModelSerializer):
     tickets = TicketCreateSerializer(many=True, read_only=True)
@@ -104,19 +101,111 @@ class OrderSerializer(serializers.ModelSerializer):
         read_only_fields = ("user",)
 
 
+class OrderListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Order
+        fields = (
+            "id",
+            "create_at",
+            "ticket_count",
+            "first_departure",
+            "route_label",
+        )
+
+
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+
+
+class OrderTicketSerializer(SeatSerializer):
+    flight = serializers.IntegerField(min_value=1)
+
+
+class SeatGroupSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(min_value=1)
+    count = serializers.IntegerField(min_value=1)
+
+
 class OrderCreateSerializer(serializers.ModelSerializer):
-    tickets = TicketCreateSerializer(write_only=True)
+    tickets = OrderTicketSerializer(
+        many=True,
+        write_only=True,
+        required=False
+    )
+    seat_groups = SeatGroupSerializer(
+        many=True,
+        write_only=True,
+        required=False,
+        help_text="Let the server seat each group together"
+    )
+    allow_alternative_seats = serializers.BooleanField(
+        default=False,
+        write_only=True
+    )
     order_tickets = TicketSerializer(source='tickets', read_only=True, many=True)
 
     class Meta:
         model = Order
-        fields = ("id", "tickets", "order_tickets")
+        fields = (
+            "id",
+            "tickets",
+            "seat_groups",
+            "allow_alternative_seats",
+            "order_tickets",
+        )
+
+    def validate(self, attrs):
+        if not attrs.get("tickets") and not attrs.get("seat_groups"):
+            raise serializers.ValidationError(
+                "Order needs tickets or seat_groups."
+            )
+        return attrs
 
     def create(self, validated_data):
-        ticket_data = validated_data.pop("tickets")
-        order = Order.objects.create(user=self.context['request'].user)
-        Ticket.objects.create(order=order, **ticket_data)
-        return order
+        order = book_tickets(
+            self.context['request'].user,
+            validated_data.get("tickets", []),
+            allow_alternatives=validated_data["allow_alternative_seats"],
+            groups=validated_data.get("seat_groups", []),
+        )
+        return Order.objects.prefetch_related(
+            Prefetch(
+                "tickets",
+                queryset=Ticket.objects.select_related(
+                    "flight__route__source",
+                    "flight__route__destination",
+                ).order_by("id"),
+            )
+        ).get(pk=order.pk)
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ("id", "flight", "row", "seat", "expires_at")
+        read_only_fields = fields
+
+
+class SeatHoldCreateSerializer(serializers.Serializer):
+    flight = serializers.IntegerField(min_value=1)
+    seats = SeatSerializer(many=True, allow_empty=False)
+
+
+class BookingRequestSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BookingRequest
+        fields = (
+            "id",
+            "status",
+            "flight",
+            "order",
+            "status_code",
+            "result",
+            "created_at",
+            "processed_at",
+        )
+        read_only_fields = fields
 
 
 class RouteSerializer(serializers.ModelSerializer):
@@ -159,6 +248,13 @@ class RouteListSerializer(RouteSerializer):
         )
 
 
+def format_duration(duration) -> str:
+    total_minutes = int(duration.total_seconds() // 60)
+    hours = total_minutes // 60
+    minutes = total_minutes % 60
+    return f"{hours}h {minutes}m"
+
+
 class FlightSerializer(serializers.ModelSerializer):
     class Meta:
         model = Flight
@@ -168,10 +264,15 @@ class FlightSerializer(serializers.ModelSerializer):
 class FlightListSerializer(serializers.ModelSerializer):
     route = RouteListSerializer(read_only=True)
     airplane = AirplaneListSerializer(read_only=True)
-    tickets_available = serializers.IntegerField(read_only=True)
+    tickets_available = serializers.IntegerField(
+        read_only=True,
+        source="seats_remaining"
+    )
     duration = serializers.SerializerMethodField()
     crews = serializers.IntegerField(read_only=True, source="crew_count")
 
+    field_sources = {"duration": ("departure_time", "arrival_time")}
+
     class Meta:
         model = Flight
         fields = (
@@ -186,11 +287,7 @@ class FlightListSerializer(serializers.ModelSerializer):
         )
 
     def get_duration(self, obj):
-        duration = obj.arrival_time - obj.departure_time
-        total_minutes = int(duration.total_seconds() // 60)
-        hours = total_minutes // 60
-        minutes = total_minutes % 60
-        return f"{hours}h {minutes}m"
+        return format_duration(obj.arrival_time - obj.departure_time)
 
 
 class FlightCreateUpdateSerializer(serializers.ModelSerializer):
@@ -216,6 +313,11 @@ class FlightRetrieveSerializer(FlightListSerializer):
     crews = CrewListSerializer(read_only=True, many=True)
     taken_seats = serializers.SerializerMethodField()
 
+    field_sources = {
+        **FlightListSerializer.field_sources,
+        "taken_seats": (),
+    }
+
     class Meta:
         model = Flight
         fields = (
@@ -230,13 +332,114 @@ class FlightRetrieveSerializer(FlightListSerializer):
         )
 
     def get_taken_seats(self, obj):
-        seats = {}
-        for ticket in obj.tickets.all():
-            seats.setdefault(ticket.row, []).append(ticket.seat)
-        return {
-            row: sorted(seats_list)
-            for row, seats_list in sorted(seats.items())
-        }
+        return get_seat_map(obj.id).taken_seats()
+
+
+class ConnectionSearchSerializer(serializers.Serializer):
+    departure_city = serializers.CharField()
+    arrival_city = serializers.CharField()
+    departure_date = serializers.DateField()
+    max_legs = serializers.IntegerField(min_value=1, max_value=3, default=2)
+    min_layover = serializers.IntegerField(min_value=0, default=45)
+    max_layover = serializers.IntegerField(min_value=0, default=360)
+    seats = serializers.IntegerField(min_value=1, default=1)
+    ordering = serializers.ChoiceField(
+        choices=("duration", "distance"),
+        default="duration"
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+    def validate(self, attrs):
+        if attrs["min_layover"] > attrs["max_layover"]:
+            raise serializers.ValidationError(
+                {"max_layover": "max_layover must be >= min_layover"}
+            )
+        return attrs
+
+
+class CalendarSearchSerializer(serializers.Serializer):
+    departure_city = serializers.CharField()
+    arrival_city = serializers.CharField()
+    month = serializers.DateField(
+        input_formats=["%Y-%m"],
+        help_text="Month in YYYY-MM format"
+    )
+
+
+class CalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField(source="day")
+    flights = serializers.IntegerField()
+    earliest_departure = serializers.DateTimeField()
+    tickets_available = serializers.IntegerField()
+
+
+class ExportSerializer(serializers.Serializer):
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    output = serializers.ChoiceField(
+        choices=("ndjson", "csv"),
+        default="ndjson"
+    )
+
+
+class ManifestSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+        choices=("json", "csv"),
+        default="json"
+    )
+
+
+class ManifestEntrySerializer(serializers.Serializer):
+    ticket_id = serializers.IntegerField()
+    row = serializers.IntegerField()
+    seat = serializers.IntegerField()
+    order_id = serializers.IntegerField()
+    email = serializers.EmailField()
+    first_name = serializers.CharField()
+    last_name = serializers.CharField()
+
+
+class BoardingPassSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+        choices=("png", "pdf"),
+        default="png"
+    )
+
+
+class SeatMapSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    tickets_available = serializers.IntegerField()
+    taken_seats = serializers.DictField(required=False)
+    bitset = serializers.CharField(required=False)
+
+
+class ConnectionLegSerializer(serializers.ModelSerializer):
+    route = RouteListSerializer(read_only=True)
+    tickets_available = serializers.IntegerField(
+        read_only=True,
+        source="seats_remaining"
+    )
+
+    class Meta:
+        model = Flight
+        fields = (
+            "id",
+            "departure_time",
+            "arrival_time",
+            "route",
+            "tickets_available"
+        )
+
+
+class ConnectionSerializer(serializers.Serializer):
+    legs = ConnectionLegSerializer(many=True, read_only=True)
+    duration = serializers.SerializerMethodField()
+    distance = serializers.IntegerField(read_only=True)
+
+    def get_duration(self, obj):
+        return format_duration(obj["duration"])
 
 
 class PositionSerializer(serializers.ModelSerializer):
@@ -248,7 +451,7 @@ class PositionSerializer(serializers.ModelSerializer):
 class AirportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Airport
-        fields = ("id", "name", "city")
+        fields = ("id", "name", "iata_code", "icao_code", "city")
 
 
 class AirportListSerializer(serializers.ModelSerializer):
@@ -263,7 +466,7 @@ class AirportListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Airport
-        fields = ("id", "name", "country", "city")
+        fields = ("id", "name", "iata_code", "icao_code", "country", "city")
 
 
 class CitySerializer(serializers.ModelSerializer):
@@ -0,0 +1,205 @@
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from core.booking import bulk_cancellation, release_holds
+from core.cache import (
+    AIRPORTS_SCOPE,
+    flight_scopes,
+    invalidate_flights,
+    invalidate_scopes,
+)
+from core.connections import flight_graph
+from core.dimensions import airplane_dimensions
+from core.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+
+@receiver(post_save, sender=Ticket)
+def take_seat(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Flight.objects.filter(pk=instance.flight_id).update(
+            seats_remaining=F("seats_remaining") - 1
+        )
+
+
+@receiver(post_delete, sender=Ticket)
+def release_seat(sender, instance, **kwargs):
+    if not bulk_cancellation.get():
+        Flight.objects.filter(pk=instance.flight_id).update(
+            seats_remaining=F("seats_remaining") + 1
+        )
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def release_user_holds(sender, instance, **kwargs):
+    # The cascade would delete the holds without giving their seats back.
+    release_holds(instance.seat_holds.all())
+
+
+@receiver(post_save, sender=Flight)
+def reconcile_flight_seats(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        Flight.objects.filter(pk=instance.pk).reconcile_seats()
+
+
+@receiver(post_save, sender=Airplane)
+def reconcile_airplane_seats(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        Flight.objects.filter(airplane=instance).reconcile_seats()
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def refresh_order_summary(sender, instance, raw=False, **kwargs):
+    if not raw and not bulk_cancellation.get():
+        Order.objects.filter(pk=instance.order_id).refresh_summaries()
+
+
+@receiver(post_save, sender=Flight)
+def refresh_flight_order_summaries(
+        sender, instance, created, raw=False, **kwargs
+):
+    if not created and not raw:
+        Order.objects.filter(
+            tickets__flight=instance
+        ).refresh_summaries()
+
+
+@receiver(post_save, sender=Route)
+def refresh_route_order_summaries(
+        sender, instance, created, raw=False, **kwargs
+):
+    if not created and not raw:
+        Order.objects.filter(
+            tickets__flight__route=instance
+        ).refresh_summaries()
+
+
+@receiver(post_save, sender=Airport)
+def refresh_airport_order_summaries(
+        sender, instance, created, raw=False, **kwargs
+):
+    if not created and not raw:
+        Order.objects.filter(
+            Q(tickets__flight__route__source=instance)
+            | Q(tickets__flight__route__destination=instance)
+        ).refresh_summaries()
+
+
+@receiver(post_save, sender=Flight)
+def refresh_flight_graph(sender, instance, raw=False, **kwargs):
+    if not raw:
+        flight_graph.refresh_flights([instance.pk])
+
+
+@receiver(post_delete, sender=Flight)
+def remove_from_flight_graph(sender, instance, **kwargs):
+    flight_graph.remove_flight(instance.pk)
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def invalidate_flight_dimensions(
+        sender, instance, created=False, raw=False, **kwargs
+):
+    # New flights cannot be cached yet.
+    if not raw and not created:
+        airplane_dimensions.invalidate([instance.pk])
+
+
+@receiver(post_save, sender=Airplane)
+def invalidate_airplane_dimensions(
+        sender, instance, created, raw=False, **kwargs
+):
+    if not raw and not created:
+        airplane_dimensions.invalidate(
+            Flight.objects.filter(airplane=instance).values_list(
+                "id", flat=True
+            )
+        )
+
+
+@receiver(post_save, sender=Route)
+def refresh_route_in_flight_graph(sender, instance, raw=False, **kwargs):
+    if not raw:
+        flight_graph.refresh_route(instance.pk)
+
+
+@receiver(pre_save, sender=Flight)
+def invalidate_previous_flight_searches(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk:
+        invalidate_flights(Flight.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def invalidate_flight_searches(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_scopes(flight_scopes(
+            instance.pk,
+            instance.route_id,
+            instance.departure_time,
+            instance.arrival_time,
+        ))
+
+
+@receiver(m2m_changed, sender=Flight.crews.through)
+def invalidate_crew_searches(sender, instance, pk_set, reverse, **kwargs):
+    if kwargs["action"] not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        invalidate_flights(Flight.objects.filter(pk=instance.pk))
+    elif pk_set:
+        invalidate_flights(Flight.objects.filter(pk__in=pk_set))
+    else:
+        invalidate_scopes({"global"})
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidate_ticket_searches(sender, instance, raw=False, **kwargs):
+    if not raw and not bulk_cancellation.get():
+        invalidate_flights(Flight.objects.filter(pk=instance.flight_id))
+
+
+@receiver(post_save, sender=Airplane)
+def invalidate_airplane_searches(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_flights(Flight.objects.filter(airplane=instance))
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Airport)
+@receiver(post_save, sender=City)
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=AirplaneType)
+def invalidate_all_searches(sender, created=False, raw=False, **kwargs):
+    # A new route may match an already cached city search; new airports,
+    # cities and types cannot show up in results before a route does.
+    if not raw and (sender is Route or not created):
+        invalidate_scopes({"global"})
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+def invalidate_airport_codes(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_scopes({AIRPORTS_SCOPE})
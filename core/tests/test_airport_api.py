@@ -4,6 +4,7 @@ from datetime import datetime
 
 from PIL import Image
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models import F, Count
 from django.test import TestCase
@@ -30,7 +31,7 @@ from core.serializers import (
     CrewListSerializer,
     PositionSerializer,
     TicketSerializer,
-    OrderSerializer,
+    OrderListSerializer,
     AirplaneListSerializer,
     AirplaneTypeSerializer,
     RouteListSerializer,
@@ -42,6 +43,7 @@ from core.serializers import (
 
 class AuthenticatedApiTestCase(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             email="test@test.com",
@@ -636,10 +638,10 @@ class AuthenticatedOrderApiTests(AuthenticatedApiTestCase):
     def test_order(self):
         order_1 = Order.objects.create(user=self.user)
         order_2 = Order.objects.create(user=self.user)
-        orders = [order_1, order_2]
+        orders = [order_2, order_1]
 
         res = self.client.get(ORDER_LIST_URL)
-        serializer = OrderSerializer(orders, many=True)
+        serializer = OrderListSerializer(orders, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data["results"], serializer.data)
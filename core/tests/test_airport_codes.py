@@ -0,0 +1,95 @@
+from django.db import IntegrityError
+from rest_framework import status
+
+from core.cache import airport_codes
+from core.models import Airport, Order, Ticket
+from core.serializers import AirportSerializer
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    FLIGHT_LIST_URL,
+    TICKET_LIST_URL,
+    sample_flight,
+)
+
+
+class AirportCodeTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.other_flight = sample_flight(route_params={
+            "source_city_name": "Lviv", "dest_city_name": "Odesa"
+        })
+        with self.captureOnCommitCallbacks(execute=True):
+            self.set_codes("Kyiv Airport", "KBP", "UKBB")
+            self.set_codes("Warsaw Airport", "WAW", "EPWA")
+
+    def set_codes(self, name, iata_code, icao_code):
+        airport = Airport.objects.get(name=name)
+        airport.iata_code = iata_code
+        airport.icao_code = icao_code
+        airport.save()
+        return airport
+
+    def flight_ids(self, **params):
+        res = self.client.get(FLIGHT_LIST_URL, data=params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in res.data["results"]]
+
+    def test_flights_filtered_by_exact_code(self):
+        self.assertEqual(self.flight_ids(source_code="KBP"), [self.flight.id])
+        self.assertEqual(
+            self.flight_ids(destination_code="epwa"), [self.flight.id]
+        )
+        self.assertEqual(self.flight_ids(source_code="KB"), [])
+
+    def test_tickets_filtered_by_code(self):
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=order
+        )
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.other_flight, order=order
+        )
+
+        res = self.client.get(TICKET_LIST_URL, data={"source_code": "KBP"})
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]], [ticket.id]
+        )
+
+    def test_code_map_is_cached(self):
+        airport_codes()
+
+        with self.assertNumQueries(0):
+            codes = airport_codes()
+
+        kyiv = Airport.objects.get(name="Kyiv Airport")
+        self.assertEqual(codes["KBP"], kyiv.id)
+        self.assertEqual(codes["UKBB"], kyiv.id)
+
+    def test_changed_code_invalidates_map(self):
+        airport_codes()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lviv = self.set_codes("Lviv Airport", "LWO", "UKLL")
+
+        self.assertEqual(airport_codes()["LWO"], lviv.id)
+        self.assertEqual(
+            self.flight_ids(source_code="LWO"), [self.other_flight.id]
+        )
+
+    def test_codes_are_unique_and_optional(self):
+        self.set_codes("Lviv Airport", "", "")
+
+        with self.assertRaises(IntegrityError):
+            self.set_codes("Lviv Airport", "KBP", None)
+
+    def test_serializer_rejects_malformed_code(self):
+        serializer = AirportSerializer(
+            Airport.objects.get(name="Kyiv Airport"),
+            data={"iata_code": "kbp1"},
+            partial=True,
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("iata_code", serializer.errors)
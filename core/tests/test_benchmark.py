@@ -0,0 +1,76 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from core.benchmark import check_integrity, compare_to_baseline, percentile
+from core.models import Flight, Order, Ticket
+from core.tests.test_airport_api import sample_flight
+
+
+class BenchmarkHelpersTests(TestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_integrity_detects_counter_drift(self):
+        flight = sample_flight()
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=flight,
+            order=Order.objects.create(
+                user=get_user_model().objects.create_user(email="a@a.com")
+            ),
+        )
+        self.assertTrue(check_integrity(flight.id)["ok"])
+
+        Flight.objects.filter(pk=flight.id).update(seats_remaining=120)
+
+        report = check_integrity(flight.id)
+        self.assertFalse(report["ok"])
+        self.assertEqual(report["seats_remaining_expected"], 119)
+
+    def test_compare_to_baseline(self):
+        report = {
+            "orders_per_second": 150,
+            "conflict_rate": 0.1,
+            "latency_ms": {"p50": 10, "p95": 20, "p99": 40},
+        }
+        baseline = {
+            "orders_per_second": 100,
+            "conflict_rate": 0,
+            "latency_ms": {"p50": 20, "p95": 20, "p99": 20},
+        }
+
+        change = compare_to_baseline(report, baseline)
+
+        self.assertEqual(change["orders_per_second"], 0.5)
+        self.assertIsNone(change["conflict_rate"])
+        self.assertEqual(change["latency_ms.p50"], -0.5)
+        self.assertEqual(change["latency_ms.p99"], 1.0)
+
+
+class BenchmarkCommandTests(TransactionTestCase):
+    def test_benchmark_reports_json_and_cleans_up(self):
+        out = StringIO()
+
+        call_command(
+            "benchmark_bookings",
+            workers=2,
+            orders=3,
+            rows=2,
+            seats_in_row=2,
+            stdout=out,
+        )
+
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["orders"], 6)
+        self.assertTrue(report["integrity"]["ok"])
+        self.assertEqual(set(report["latency_ms"]), {"p50", "p95", "p99"})
+        self.assertFalse(Flight.objects.exists())
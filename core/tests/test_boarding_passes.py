@@ -0,0 +1,128 @@
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from io import BytesIO, StringIO
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from core.boarding_passes import (
+    boarding_pass_path,
+    flight_details,
+    generate_boarding_passes,
+)
+from core.models import Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_flight,
+)
+
+
+def boarding_pass_url(ticket_id):
+    return reverse("core:ticket-boarding-pass", args=[ticket_id])
+
+
+class BoardingPassTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root, True)
+
+        self.flight = sample_flight(
+            departure_time=datetime(2030, 1, 1, 7, tzinfo=timezone.utc),
+            arrival_time=datetime(2030, 1, 1, 9, tzinfo=timezone.utc),
+        )
+        order = Order.objects.create(user=self.user)
+        self.tickets = [
+            Ticket.objects.create(
+                row=1, seat=seat, flight=self.flight, order=order
+            )
+            for seat in (1, 2, 3)
+        ]
+
+    def pass_path(self, ticket, output="png"):
+        flight = flight_details([self.flight.id])[self.flight.id]
+        return boarding_pass_path(flight, ticket.id, output)
+
+    def test_generates_missing_passes_only(self):
+        first = generate_boarding_passes(self.flight.id, workers=1)
+        second = generate_boarding_passes(self.flight.id, workers=1)
+
+        self.assertEqual((first, second), (3, 0))
+
+        with Image.open(self.pass_path(self.tickets[0])) as image:
+            self.assertEqual(image.format, "PNG")
+
+    def test_process_pool_renders_pdf(self):
+        generated = generate_boarding_passes(
+            self.flight.id, output="pdf", workers=2
+        )
+
+        self.assertEqual(generated, 3)
+        for ticket in self.tickets:
+            content = self.pass_path(ticket, "pdf").read_bytes()
+            self.assertTrue(content.startswith(b"%PDF"))
+
+    def test_changed_flight_gets_new_passes(self):
+        generate_boarding_passes(self.flight.id, workers=1)
+        old_path = self.pass_path(self.tickets[0])
+
+        self.flight.departure_time = datetime(
+            2030, 1, 1, 8, tzinfo=timezone.utc
+        )
+        self.flight.save()
+
+        self.assertNotEqual(self.pass_path(self.tickets[0]), old_path)
+        self.assertEqual(
+            generate_boarding_passes(self.flight.id, workers=1), 3
+        )
+
+    def test_download(self):
+        generate_boarding_passes(self.flight.id, workers=1)
+
+        res = self.client.get(boarding_pass_url(self.tickets[0].id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "image/png")
+        with Image.open(BytesIO(b"".join(res.streaming_content))) as image:
+            self.assertEqual(image.format, "PNG")
+
+    def test_download_is_never_rendered_on_request(self):
+        res = self.client.get(boarding_pass_url(self.tickets[0].id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(self.pass_path(self.tickets[0]).exists())
+
+    def test_download_with_non_numeric_id(self):
+        res = self.client.get(boarding_pass_url("first"))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_download_of_others_ticket(self):
+        generate_boarding_passes(self.flight.id, workers=1)
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(email="other@test.com")
+        )
+
+        res = self.client.get(boarding_pass_url(self.tickets[0].id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "generate_boarding_passes",
+            str(self.flight.id),
+            "--workers=1",
+            stdout=out,
+        )
+
+        self.assertIn("Generated 3", out.getvalue())
+        self.assertTrue(self.pass_path(self.tickets[2]).exists())
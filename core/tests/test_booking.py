@@ -0,0 +1,278 @@
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework import status
+
+from core import booking
+from core.booking import STRATEGIES
+from core.models import Flight, Order, Ticket
+from core.seatmap import get_seat_map
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    ORDER_LIST_URL,
+    sample_flight,
+)
+
+
+class OrderBookingTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.other_flight = sample_flight()
+
+    def post_order(self, *seats):
+        return self.client.post(
+            ORDER_LIST_URL,
+            {
+                "tickets": [
+                    {"flight": flight.id, "row": row, "seat": seat}
+                    for flight, row, seat in seats
+                ]
+            },
+            format="json",
+        )
+
+    def test_order_with_tickets_on_several_flights(self):
+        res = self.post_order(
+            (self.flight, 1, 1),
+            (self.flight, 1, 2),
+            (self.other_flight, 5, 6),
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data["order_tickets"]), 3)
+        order = Order.objects.get(pk=res.data["id"])
+        self.assertEqual(order.user, self.user)
+        self.assertEqual(order.tickets.count(), 3)
+        self.assertEqual(
+            Flight.objects.get(pk=self.flight.id).seats_remaining, 118
+        )
+        self.assertEqual(
+            Flight.objects.get(pk=self.other_flight.id).seats_remaining, 119
+        )
+
+    def test_query_count_does_not_grow_with_tickets(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertNumQueries(17):
+                self.post_order(*(
+                    (self.flight, row, seat)
+                    for row in range(1, 4)
+                    for seat in range(1, 7)
+                ))
+        self.assertTrue(callbacks)
+
+    def test_taken_seat_rejects_whole_order(self):
+        Ticket.objects.create(
+            row=1,
+            seat=2,
+            flight=self.flight,
+            order=Order.objects.create(user=self.user),
+        )
+
+        res = self.post_order((self.flight, 1, 1), (self.flight, 1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["code"], "seat_conflict")
+        self.assertEqual(
+            res.data["conflicts"],
+            [{
+                "index": 1,
+                "flight": self.flight.id,
+                "row": 1,
+                "seat": 2,
+                "reason": "sold",
+            }]
+        )
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_errors_reported_per_seat(self):
+        res = self.post_order(
+            (self.flight, 100, 1),
+            (self.flight, 2, 2),
+            (self.flight, 2, 2),
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("row", res.data["tickets"][0])
+        self.assertIn("seat", res.data["tickets"][1])
+        self.assertIn("seat", res.data["tickets"][2])
+        self.assertFalse(Order.objects.exists())
+
+    def test_unknown_flight(self):
+        res = self.client.post(
+            ORDER_LIST_URL,
+            {"tickets": [{"flight": 10000, "row": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("flight", res.data["tickets"][0])
+
+    def test_empty_order_rejected(self):
+        res = self.client.post(
+            ORDER_LIST_URL, {"tickets": []}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_booking_invalidates_seat_map(self):
+        get_seat_map(self.flight.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post_order((self.flight, 3, 3))
+
+        self.assertEqual(get_seat_map(self.flight.id).taken_seats(), {3: [3]})
+
+
+class BookingStrategyTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=self.flight,
+            order=Order.objects.create(user=self.user),
+        )
+
+    def post_order(self, row, seat, **extra):
+        return self.client.post(
+            ORDER_LIST_URL,
+            {
+                "tickets": [
+                    {"flight": self.flight.id, "row": row, "seat": seat}
+                ],
+                **extra,
+            },
+            format="json",
+        )
+
+    def test_every_strategy_books_and_reports_conflicts(self):
+        for strategy in STRATEGIES:
+            with self.subTest(strategy=strategy):
+                with override_settings(BOOKING_CONCURRENCY=strategy):
+                    conflict = self.post_order(1, 1)
+                    created = self.post_order(
+                        2, STRATEGIES.index(strategy) + 1
+                    )
+
+                self.assertEqual(
+                    conflict.status_code, status.HTTP_409_CONFLICT
+                )
+                self.assertEqual(conflict.data["strategy"], strategy)
+                self.assertEqual(
+                    created.status_code, status.HTTP_201_CREATED
+                )
+
+    def test_alternative_seat_fallback(self):
+        res = self.post_order(1, 1, allow_alternative_seats=True)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        ticket = res.data["order_tickets"][0]
+        self.assertEqual((ticket["row"], ticket["seat"]), (1, 2))
+
+    @override_settings(BOOKING_CONCURRENCY="optimistic", BOOKING_MAX_RETRIES=2)
+    def test_optimistic_retries_lost_insert_race(self):
+        # Pretend the seat looked free, so the insert hits the constraint.
+        with mock.patch(
+            "core.booking.seat_conflicts", return_value=[]
+        ) as seat_conflicts:
+            res = self.post_order(1, 1)
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["conflicts"][0]["reason"], "contention")
+        self.assertEqual(seat_conflicts.call_count, 3)
+        self.assertEqual(Order.objects.count(), 1)
+
+    @override_settings(
+        BOOKING_CONCURRENCY="skip_locked",
+        BOOKING_MAX_RETRIES=2,
+        BOOKING_RETRY_BACKOFF=0,
+    )
+    def test_skip_locked_retries_busy_flight(self):
+        with mock.patch(
+            "core.booking.try_lock_flights", side_effect=[False, True]
+        ) as try_lock:
+            res = self.post_order(2, 2)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(try_lock.call_count, 2)
+
+    @override_settings(
+        BOOKING_CONCURRENCY="skip_locked",
+        BOOKING_MAX_RETRIES=2,
+        BOOKING_RETRY_BACKOFF=0,
+    )
+    def test_skip_locked_queues_after_retries(self):
+        with mock.patch(
+            "core.booking.try_lock_flights", return_value=False
+        ) as try_lock, mock.patch(
+            "core.booking.lock_flights", wraps=booking.lock_flights
+        ) as lock_flights:
+            res = self.post_order(2, 2)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(try_lock.call_count, 3)
+        lock_flights.assert_any_call([self.flight.id])
+
+
+class SeatGroupBookingTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        order = Order.objects.create(user=self.user)
+        for seat in (1, 3, 5):
+            Ticket.objects.create(
+                row=1, seat=seat, flight=self.flight, order=order
+            )
+
+    def post_groups(self, *counts, tickets=()):
+        return self.client.post(
+            ORDER_LIST_URL,
+            {
+                "tickets": list(tickets),
+                "seat_groups": [
+                    {"flight": self.flight.id, "count": count}
+                    for count in counts
+                ],
+            },
+            format="json",
+        )
+
+    def seats(self, res):
+        return [
+            (ticket["row"], ticket["seat"])
+            for ticket in res.data["order_tickets"]
+        ]
+
+    def test_group_seated_together(self):
+        res = self.post_groups(3)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.seats(res), [(2, 1), (2, 2), (2, 3)])
+        self.assertEqual(
+            Flight.objects.get(pk=self.flight.id).seats_remaining, 114
+        )
+
+    def test_groups_avoid_explicit_tickets_and_each_other(self):
+        res = self.post_groups(
+            1, 2,
+            tickets=[{"flight": self.flight.id, "row": 1, "seat": 2}],
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted(self.seats(res)), [(1, 2), (1, 4), (2, 1), (2, 2)]
+        )
+
+    def test_no_block_left(self):
+        res = self.post_groups(118)
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(res.data["conflicts"][0]["reason"], "no_block")
+
+    def test_order_needs_tickets_or_groups(self):
+        res = self.post_groups()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
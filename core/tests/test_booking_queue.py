@@ -0,0 +1,166 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from django.urls import reverse
+from rest_framework import status
+
+from core.booking_queue import (
+    claim_batch,
+    enqueue_booking,
+    process_batch,
+    process_request,
+    requeue_stale,
+)
+from core.dimensions import airplane_dimensions
+from core.models import BookingRequest, Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    ORDER_LIST_URL,
+    sample_flight,
+)
+
+
+def booking_request_url(booking_request_id):
+    return reverse("core:bookingrequest-detail", args=[booking_request_id])
+
+
+class BookingQueueTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        airplane_dimensions.reset()
+        self.flight = sample_flight()
+
+    def order_data(self, *seats, flight=None):
+        return {
+            "tickets": [
+                {"flight": (flight or self.flight).id, "row": row,
+                 "seat": seat}
+                for row, seat in seats
+            ],
+            "allow_alternative_seats": False,
+        }
+
+    def post_async(self, payload):
+        return self.client.post(
+            ORDER_LIST_URL,
+            payload,
+            format="json",
+            headers={"Prefer": "respond-async"},
+        )
+
+    def test_async_order_is_queued(self):
+        res = self.post_async(self.order_data((1, 1)))
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res.data["status"], BookingRequest.PENDING)
+        self.assertEqual(res["Preference-Applied"], "respond-async")
+        self.assertTrue(
+            res["Location"].endswith(booking_request_url(res.data["id"]))
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_invalid_seat_rejected_before_queueing(self):
+        res = self.post_async(self.order_data((21, 1)))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(BookingRequest.objects.exists())
+
+    def test_processed_request_reports_order(self):
+        queued = self.post_async(self.order_data((1, 1), (1, 2)))
+
+        self.assertEqual(process_batch(), 1)
+
+        res = self.client.get(booking_request_url(queued.data["id"]))
+        self.assertEqual(res.data["status"], BookingRequest.SUCCEEDED)
+        self.assertEqual(res.data["status_code"], status.HTTP_201_CREATED)
+        order = Order.objects.get(user=self.user)
+        self.assertEqual(res.data["order"], order.id)
+        self.assertEqual(order.tickets.count(), 2)
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_remaining, 20 * 6 - 2)
+
+    def test_conflict_recorded_as_failure(self):
+        first = enqueue_booking(self.user, self.order_data((1, 1)))
+        second = enqueue_booking(self.user, self.order_data((1, 1)))
+
+        process_batch()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, BookingRequest.SUCCEEDED)
+        self.assertEqual(second.status, BookingRequest.FAILED)
+        self.assertEqual(second.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(second.result["code"], "seat_conflict")
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_batches_are_per_flight(self):
+        other = sample_flight()
+        enqueue_booking(self.user, self.order_data((1, 1)))
+        enqueue_booking(self.user, self.order_data((1, 1), flight=other))
+        enqueue_booking(self.user, self.order_data((2, 2)))
+
+        batch = claim_batch()
+
+        self.assertEqual(
+            {booking_request.flight_id for booking_request in batch},
+            {self.flight.id},
+        )
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(
+            BookingRequest.objects.filter(
+                status=BookingRequest.PENDING
+            ).get().flight_id,
+            other.id,
+        )
+
+    def test_lost_claim_is_not_booked(self):
+        enqueue_booking(self.user, self.order_data((1, 1)))
+        [slow] = claim_batch()
+        BookingRequest.objects.update(
+            claimed_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(requeue_stale(60), 1)
+        [fast] = claim_batch()
+
+        self.assertTrue(process_request(fast))
+        self.assertFalse(process_request(slow))
+
+        self.assertEqual(Ticket.objects.count(), 1)
+        self.assertEqual(
+            BookingRequest.objects.get().status, BookingRequest.SUCCEEDED
+        )
+
+    def test_claim_skips_requests_no_longer_pending(self):
+        enqueue_booking(self.user, self.order_data((1, 1)))
+        claim_batch()
+
+        self.assertEqual(claim_batch(), [])
+
+    def test_requests_are_private(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="12345"
+        )
+        booking_request = enqueue_booking(
+            other_user, self.order_data((1, 1))
+        )
+
+        res = self.client.get(booking_request_url(booking_request.id))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command_drains_queue(self):
+        enqueue_booking(self.user, self.order_data((1, 1)))
+        enqueue_booking(self.user, self.order_data((1, 2)))
+
+        out = StringIO()
+        call_command("process_bookings", "--once", stdout=out)
+
+        self.assertIn("Processed 2", out.getvalue())
+        self.assertFalse(
+            BookingRequest.objects.exclude(
+                status=BookingRequest.SUCCEEDED
+            ).exists()
+        )
@@ -0,0 +1,77 @@
+from datetime import datetime
+
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_flight,
+)
+
+CALENDAR_URL = reverse("core:flight-calendar")
+
+
+class FlightCalendarApiTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        route_params = {"source_city_name": "Kyiv", "dest_city_name": "Paris"}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.early = sample_flight(
+                route_params=route_params,
+                departure_time=datetime(2025, 12, 1, 7, 0),
+            )
+            sample_flight(
+                route_params=route_params,
+                departure_time=datetime(2025, 12, 1, 18, 0),
+            )
+            sample_flight(
+                route_params=route_params,
+                departure_time=datetime(2025, 12, 31, 23, 0),
+            )
+            sample_flight(
+                route_params=route_params,
+                departure_time=datetime(2026, 1, 1, 0, 0),
+            )
+        self.params = {
+            "departure_city": "Kyiv",
+            "arrival_city": "Paris",
+            "month": "2025-12",
+        }
+
+    def test_calendar_groups_by_day(self):
+        res = self.client.get(CALENDAR_URL, data=self.params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                (day["date"], day["flights"], day["tickets_available"])
+                for day in res.data
+            ],
+            [("2025-12-01", 2, 240), ("2025-12-31", 1, 120)]
+        )
+        self.assertEqual(
+            res.data[0]["earliest_departure"],
+            "2025-12-01T07:00:00Z"
+        )
+
+    def test_calendar_cache_invalidated_by_ticket(self):
+        self.client.get(CALENDAR_URL, data=self.params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                row=1,
+                seat=1,
+                flight=self.early,
+                order=Order.objects.create(user=self.user),
+            )
+
+        res = self.client.get(CALENDAR_URL, data=self.params)
+        self.assertEqual(res.data[0]["tickets_available"], 239)
+
+    def test_calendar_invalid_month(self):
+        res = self.client.get(
+            CALENDAR_URL, data={**self.params, "month": "12"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
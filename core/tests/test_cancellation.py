@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+
+from core.booking import cancel_orders
+from core.models import Flight, Order, Ticket
+from core.seatmap import get_seat_map
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    ORDER_LIST_URL,
+    sample_flight,
+)
+
+
+def order_cancel_url(order_id):
+    return reverse("core:order-cancel", args=[order_id])
+
+
+def ticket_cancel_url(ticket_id):
+    return reverse("core:ticket-cancel", args=[ticket_id])
+
+
+class CancellationTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.other_flight = sample_flight()
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                ORDER_LIST_URL,
+                {
+                    "tickets": [
+                        {"flight": self.flight.id, "row": 1, "seat": 1},
+                        {"flight": self.flight.id, "row": 1, "seat": 2},
+                        {"flight": self.other_flight.id, "row": 2,
+                         "seat": 3},
+                    ]
+                },
+                format="json",
+            )
+        self.order = Order.objects.get(pk=res.data["id"])
+
+    def seats_remaining(self, flight):
+        return Flight.objects.get(pk=flight.id).seats_remaining
+
+    def test_cancel_order_frees_seats(self):
+        get_seat_map(self.flight.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(order_cancel_url(self.order.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(Ticket.objects.exists())
+        self.assertEqual(self.seats_remaining(self.flight), 120)
+        self.assertEqual(self.seats_remaining(self.other_flight), 120)
+        self.assertEqual(get_seat_map(self.flight.id).taken_seats(), {})
+
+    def test_cancel_query_count_does_not_grow_with_tickets(self):
+        with self.assertNumQueries(18):
+            self.client.post(order_cancel_url(self.order.id))
+
+    def test_cancel_ticket_keeps_rest_of_order(self):
+        ticket = self.order.tickets.get(flight=self.flight, seat=1)
+        get_seat_map(self.flight.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(ticket_cancel_url(ticket.id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.order.tickets.count(), 2)
+        self.assertEqual(self.seats_remaining(self.flight), 119)
+        self.assertEqual(
+            get_seat_map(self.flight.id).taken_seats(), {1: [2]}
+        )
+
+    def test_cancel_last_ticket_deletes_order(self):
+        for ticket in self.order.tickets.all():
+            self.client.post(ticket_cancel_url(ticket.id))
+
+        self.assertFalse(Order.objects.exists())
+
+    def test_cannot_cancel_others_tickets(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="12345"
+        )
+        self.client.force_authenticate(other_user)
+        ticket = self.order.tickets.first()
+
+        order_res = self.client.post(order_cancel_url(self.order.id))
+        ticket_res = self.client.post(ticket_cancel_url(ticket.id))
+
+        self.assertEqual(order_res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(ticket_res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Ticket.objects.count(), 3)
+
+    def test_cancel_non_numeric_ticket(self):
+        res = self.client.post(ticket_cancel_url("first"))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_orders_in_bulk(self):
+        cancelled = cancel_orders(Order.objects.all())
+
+        self.assertEqual(cancelled, 3)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(self.seats_remaining(self.flight), 120)
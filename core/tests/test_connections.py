@@ -0,0 +1,135 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from core.connections import flight_graph
+from core.models import Airport, City, Country, Flight, Route
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_airplane,
+)
+
+CONNECTIONS_URL = reverse("core:flight-connections")
+
+
+def sample_airport_in(city_name: str) -> Airport:
+    country, _ = Country.objects.get_or_create(name="Europe")
+    city = City.objects.create(name=city_name, country=country)
+    return Airport.objects.create(name=f"{city_name} Airport", city=city)
+
+
+class FlightConnectionsApiTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        flight_graph.reset()
+        self.kyiv = sample_airport_in("Kyiv")
+        self.warsaw = sample_airport_in("Warsaw")
+        self.paris = sample_airport_in("Paris")
+        self.day = (timezone.now() + timedelta(days=3)).replace(
+            hour=6, minute=0, second=0, microsecond=0
+        )
+
+    def flight(self, source, destination, depart_hours, hours, distance=500):
+        route, _ = Route.objects.get_or_create(
+            source=source,
+            destination=destination,
+            defaults={"distance": distance},
+        )
+        departure = self.day + timedelta(hours=depart_hours)
+        return Flight.objects.create(
+            route=route,
+            airplane=sample_airplane(),
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=hours),
+        )
+
+    def search(self, **params):
+        data = {
+            "departure_city": "kyiv",
+            "arrival_city": "paris",
+            "departure_date": self.day.date().isoformat(),
+        }
+        data.update(params)
+        return self.client.get(CONNECTIONS_URL, data=data)
+
+    def test_two_leg_connection(self):
+        first = self.flight(self.kyiv, self.warsaw, 0, 2)
+        second = self.flight(self.warsaw, self.paris, 3, 2)
+        self.flight(self.warsaw, self.paris, 1, 2)
+
+        res = self.search()
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 1)
+        self.assertEqual(
+            [leg["id"] for leg in res.data[0]["legs"]],
+            [first.id, second.id]
+        )
+        self.assertEqual(res.data[0]["duration"], "5h 0m")
+        self.assertEqual(res.data[0]["distance"], 1000)
+
+    def test_layover_window_and_ordering(self):
+        self.flight(self.kyiv, self.warsaw, 0, 2)
+        self.flight(self.warsaw, self.paris, 10, 2)
+        direct = self.flight(self.kyiv, self.paris, 1, 3, distance=1500)
+
+        res = self.search(max_layover=120)
+        self.assertEqual(
+            [[leg["id"] for leg in item["legs"]] for item in res.data],
+            [[direct.id]]
+        )
+
+        res = self.search(max_layover=600)
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(res.data[0]["legs"][0]["id"], direct.id)
+
+        res = self.search(max_layover=600, ordering="distance")
+        self.assertEqual(res.data[0]["distance"], 1000)
+
+    def test_full_leg_is_skipped(self):
+        self.flight(self.kyiv, self.warsaw, 0, 2)
+        second = self.flight(self.warsaw, self.paris, 3, 2)
+        Flight.objects.filter(pk=second.pk).update(seats_remaining=0)
+
+        res = self.search()
+
+        self.assertEqual(res.data, [])
+
+    def test_graph_follows_flight_changes(self):
+        self.flight(self.kyiv, self.warsaw, 0, 2)
+        second = self.flight(self.warsaw, self.paris, 3, 2)
+        self.assertEqual(len(self.search().data), 1)
+
+        second.departure_time = self.day + timedelta(hours=20)
+        second.arrival_time = self.day + timedelta(hours=22)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.save()
+        self.assertEqual(len(self.search().data), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+            self.flight(self.warsaw, self.paris, 4, 2)
+        self.assertEqual(len(self.search().data), 1)
+
+    def test_rolled_back_change_keeps_graph(self):
+        self.flight(self.kyiv, self.warsaw, 0, 2)
+        second = self.flight(self.warsaw, self.paris, 3, 2)
+        self.assertEqual(len(self.search().data), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    second.departure_time = self.day + timedelta(hours=20)
+                    second.arrival_time = self.day + timedelta(hours=22)
+                    second.save()
+                    raise RuntimeError
+
+        self.assertEqual(len(self.search().data), 1)
+
+    def test_invalid_params(self):
+        res = self.search(max_legs=10)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.dimensions import airplane_dimensions
+from core.models import Order, Ticket
+from core.tests.test_airport_api import sample_airplane, sample_flight
+
+
+class AirplaneDimensionCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        airplane_dimensions.reset()
+        self.flight = sample_flight()
+
+    def test_many_flights_loaded_with_one_query(self):
+        other = sample_flight(airplane=sample_airplane(rows=3))
+
+        with self.assertNumQueries(1):
+            dimensions = airplane_dimensions.get_many(
+                [self.flight.id, other.id, 10000]
+            )
+        with self.assertNumQueries(0):
+            airplane_dimensions.get_many([self.flight.id, other.id])
+
+        self.assertEqual(
+            dimensions, {self.flight.id: (20, 6), other.id: (3, 6)}
+        )
+
+    def test_ticket_validation_uses_cache(self):
+        airplane_dimensions.get(self.flight.id)
+        ticket = Ticket(row=21, seat=1, flight_id=self.flight.id)
+
+        with self.assertNumQueries(0):
+            with self.assertRaises(ValueError):
+                ticket.clean()
+
+    def test_resized_airplane_invalidates(self):
+        airplane_dimensions.get(self.flight.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.airplane.rows = 30
+            self.flight.airplane.save()
+
+        self.assertEqual(airplane_dimensions.get(self.flight.id), (30, 6))
+
+    def test_changed_airplane_invalidates(self):
+        airplane_dimensions.get(self.flight.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.airplane = sample_airplane(seats_in_row=4)
+            self.flight.save()
+
+        self.assertEqual(airplane_dimensions.get(self.flight.id), (20, 4))
+
+    def test_changed_flight_keeps_other_entries(self):
+        other = sample_flight()
+        airplane_dimensions.get_many([self.flight.id, other.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.airplane = sample_airplane(seats_in_row=4)
+            self.flight.save()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(airplane_dimensions.get(other.id), (20, 6))
+        self.assertEqual(airplane_dimensions.get(self.flight.id), (20, 4))
+
+    @override_settings(AIRPLANE_DIMENSIONS_CACHE_SIZE=2)
+    def test_least_recently_used_entry_is_evicted(self):
+        second, third = sample_flight(), sample_flight()
+        airplane_dimensions.get(self.flight.id)
+        airplane_dimensions.get(second.id)
+        airplane_dimensions.get(self.flight.id)
+
+        airplane_dimensions.get(third.id)
+
+        with self.assertNumQueries(0):
+            airplane_dimensions.get_many([self.flight.id, third.id])
+        with self.assertNumQueries(1):
+            airplane_dimensions.get(second.id)
+
+    def test_new_tickets_keep_cache(self):
+        dimensions = airplane_dimensions.get(self.flight.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                row=1,
+                seat=1,
+                flight=self.flight,
+                order=Order.objects.create(
+                    user=get_user_model().objects.create_user(
+                        email="test@test.com"
+                    )
+                ),
+            )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                airplane_dimensions.get(self.flight.id), dimensions
+            )
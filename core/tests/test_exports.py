@@ -0,0 +1,177 @@
+import csv
+import json
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    sample_flight,
+)
+
+SCHEDULE_EXPORT_URL = reverse("core:flight-export")
+
+
+class ScheduleExportTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        sample_flight(departure_time=datetime(2030, 1, 1, 7, 0))
+        self.flight = sample_flight(departure_time=datetime(2030, 1, 2, 7, 0))
+        sample_flight(departure_time=datetime(2030, 1, 3, 7, 0))
+        self.params = {
+            "since": "2030-01-02T00:00:00Z",
+            "until": "2030-01-03T00:00:00Z",
+        }
+
+    def test_ndjson_export(self):
+        res = self.client.get(SCHEDULE_EXPORT_URL, data=self.params)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line)
+            for line in b"".join(res.streaming_content).decode().splitlines()
+        ]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["flight_id"], self.flight.id)
+        self.assertEqual(rows[0]["source_city"], "Kyiv")
+        self.assertEqual(rows[0]["tickets_available"], 120)
+
+    def test_csv_export(self):
+        res = self.client.get(
+            SCHEDULE_EXPORT_URL,
+            data={**self.params, "output": "csv"}
+        )
+
+        content = b"".join(res.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertEqual([row["flight_id"] for row in rows], [
+            str(self.flight.id)
+        ])
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command(
+            "export_schedule",
+            "--since=2030-01-01T00:00:00",
+            stdout=out,
+        )
+
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+
+ORDER_EXPORT_URL = reverse("core:order-export")
+
+
+class OrderExportTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.order = Order.objects.create(user=self.user)
+        for seat in (1, 2):
+            Ticket.objects.create(
+                row=1, seat=seat, flight=self.flight, order=self.order
+            )
+        self.user.is_staff = True
+        self.user.save()
+
+    def export(self, **params):
+        res = self.client.get(ORDER_EXPORT_URL, data=params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return b"".join(res.streaming_content).decode()
+
+    def test_ndjson_export_has_row_per_ticket(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+
+        self.assertEqual([row["seat"] for row in rows], [1, 2])
+        self.assertEqual(rows[0]["order_id"], self.order.id)
+        self.assertEqual(rows[0]["user_email"], self.user.email)
+        self.assertEqual(rows[0]["source_airport"], "Kyiv Airport")
+
+    def test_csv_export_filters_by_order_date(self):
+        Order.objects.filter(pk=self.order.pk).update(
+            create_at=datetime(2030, 1, 1, tzinfo=dt_timezone.utc)
+        )
+
+        content = self.export(
+            output="csv",
+            since="2030-01-01T00:00:00Z",
+            until="2030-01-02T00:00:00Z",
+        )
+        empty = self.export(output="csv", since="2030-01-02T00:00:00Z")
+
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["order_id"], str(self.order.id))
+        self.assertEqual(len(empty.splitlines()), 1)
+
+    def test_export_is_staff_only(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        res = self.client.get(ORDER_EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+def manifest_url(flight_id):
+    return reverse("core:flight-manifest", args=[flight_id])
+
+
+class ManifestTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        order = Order.objects.create(user=self.user)
+        for row, seat in ((3, 1), (1, 2), (1, 1)):
+            Ticket.objects.create(
+                row=row, seat=seat, flight=self.flight, order=order
+            )
+        self.user.is_staff = True
+        self.user.save()
+
+    def test_manifest_in_seat_order_with_one_query(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(manifest_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["row"], item["seat"]) for item in res.data],
+            [(1, 1), (1, 2), (3, 1)],
+        )
+        self.assertEqual(res.data[0]["email"], self.user.email)
+
+    def test_csv_manifest(self):
+        res = self.client.get(
+            manifest_url(self.flight.id), data={"output": "csv"}
+        )
+
+        content = b"".join(res.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(content)))
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["email"], self.user.email)
+
+    def test_empty_and_unknown_flights(self):
+        empty = sample_flight()
+
+        self.assertEqual(
+            self.client.get(manifest_url(empty.id)).data, []
+        )
+        self.assertEqual(
+            self.client.get(manifest_url(10000)).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_manifest_is_staff_only(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        res = self.client.get(manifest_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,108 @@
+import json
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    FLIGHT_LIST_URL,
+    ORDER_LIST_URL,
+    ROUTE_LIST_URL,
+    TICKET_LIST_URL,
+    flight_detail_url,
+    sample_flight,
+    sample_route,
+)
+
+
+class SparseFieldsetTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, data=params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, [query["sql"] for query in queries.captured_queries]
+
+    def test_fields_trim_output_and_sql(self):
+        res, queries = self.get(
+            FLIGHT_LIST_URL,
+            fields="id,departure_time,tickets_available"
+        )
+
+        self.assertEqual(
+            res.data["results"],
+            [{
+                "id": self.flight.id,
+                "departure_time": res.data["results"][0]["departure_time"],
+                "tickets_available": 119,
+            }]
+        )
+        self.assertNotIn("JOIN", queries[-1])
+        self.assertNotIn("arrival_time", queries[-1])
+        self.assertNotIn("core_flight_crews", queries[-1])
+
+    def test_omit_nested_relation_drops_join(self):
+        res, queries = self.get(FLIGHT_LIST_URL, omit="route,crews")
+
+        item = res.data["results"][0]
+        self.assertNotIn("route", item)
+        self.assertIn("airplane", item)
+        self.assertIn("duration", item)
+        self.assertNotIn("core_route", queries[-1])
+        self.assertIn("core_airplane", queries[-1])
+
+    def test_ticket_list_only_joins_airports(self):
+        res, queries = self.get(TICKET_LIST_URL, fields="id,source")
+
+        self.assertEqual(res.data["results"][0]["source"], "Kyiv Airport")
+        self.assertNotIn("core_crew", " ".join(queries))
+        self.assertNotIn("core_order", queries[-1])
+
+    def test_order_list_served_from_summary(self):
+        res, queries = self.get(ORDER_LIST_URL)
+
+        self.assertEqual(res.data["results"][0]["ticket_count"], 1)
+        self.assertNotIn("tickets", res.data["results"][0])
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("core_ticket", " ".join(queries))
+
+
+class QueryPlanTests(AuthenticatedApiTestCase):
+    @override_settings(QUERY_PLAN_DEBUG=True)
+    def test_plan_report_header(self):
+        flight = sample_flight()
+
+        res = self.client.get(flight_detail_url(flight.id))
+
+        plan = json.loads(res["X-Query-Plan"])
+        self.assertEqual(plan["model"], "core.Flight")
+        self.assertIn("route__source__city__country", plan["select_related"])
+        self.assertNotIn("tickets", plan["prefetch"])
+        self.assertEqual(
+            plan["prefetch"]["crews"]["select_related"],
+            ["position"]
+        )
+
+    def test_no_plan_header_by_default(self):
+        res = self.client.get(ROUTE_LIST_URL)
+
+        self.assertNotIn("X-Query-Plan", res)
+
+    def test_route_list_is_one_joined_query(self):
+        sample_route()
+        sample_route(source_city_name="Lviv", dest_city_name="Berlin")
+
+        with self.assertNumQueries(2):
+            res = self.client.get(ROUTE_LIST_URL)
+
+        self.assertEqual(len(res.data["results"]), 2)
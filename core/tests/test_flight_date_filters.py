@@ -0,0 +1,75 @@
+from datetime import date, datetime, timedelta
+
+from django.db import connection
+from rest_framework import status
+
+from core.models import Flight
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    FLIGHT_LIST_URL,
+    sample_flight,
+)
+from core.views import day_start
+
+
+class FlightDateRangeFilterTests(AuthenticatedApiTestCase):
+    def test_date_from_and_date_to(self):
+        sample_flight(departure_time=datetime(2025, 3, 1, 7, 0))
+        inside = sample_flight(departure_time=datetime(2025, 3, 5, 23, 59))
+        sample_flight(departure_time=datetime(2025, 3, 6, 0, 0))
+
+        res = self.client.get(
+            FLIGHT_LIST_URL,
+            data={"date_from": "2025-03-02", "date_to": "2025-03-05"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            [inside.id]
+        )
+
+    def test_departure_date_is_half_open_range(self):
+        sample_flight(departure_time=datetime(2025, 3, 4, 23, 59))
+        inside = sample_flight(departure_time=datetime(2025, 3, 5, 0, 0))
+        sample_flight(departure_time=datetime(2025, 3, 6, 0, 0))
+
+        res = self.client.get(
+            FLIGHT_LIST_URL,
+            data={"departure_date": "2025-03-05"}
+        )
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            [inside.id]
+        )
+
+
+class FlightSearchPlanTests(AuthenticatedApiTestCase):
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn("SCAN core_flight", plan)
+
+    def test_date_range_uses_departure_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("plan text asserted for SQLite")
+        queryset = Flight.objects.filter(
+            departure_time__gte=day_start(date(2025, 3, 5)),
+            departure_time__lt=day_start(date(2025, 3, 5), days=1),
+        )
+
+        self.assertUsesIndex(queryset, "flight_departure_id_idx")
+
+    def test_route_and_date_use_composite_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("plan text asserted for SQLite")
+        flight = sample_flight()
+        start = day_start(flight.departure_time.date())
+        queryset = Flight.objects.filter(
+            route_id__in=[flight.route_id],
+            departure_time__gte=start,
+            departure_time__lt=start + timedelta(days=1),
+        )
+
+        self.assertUsesIndex(queryset, "flight_route_departure_idx")
@@ -0,0 +1,81 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import Flight, Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    FLIGHT_LIST_URL,
+    sample_flight,
+)
+
+
+class FlightSeatsCounterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="seats@test.com",
+            password="12345"
+        )
+        self.flight = sample_flight()
+        self.order = Order.objects.create(user=self.user)
+
+    def test_new_flight_has_full_capacity(self):
+        self.assertEqual(self.flight.seats_remaining, 20 * 6)
+
+    def test_ticket_create_and_delete_update_counter(self):
+        ticket = Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_remaining, 20 * 6 - 1)
+
+        ticket.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_remaining, 20 * 6)
+
+    def test_order_delete_releases_seats(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        Ticket.objects.create(
+            row=1, seat=2, flight=self.flight, order=self.order
+        )
+        self.order.delete()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_remaining, 20 * 6)
+
+    def test_airplane_resize_reconciles_flights(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        airplane = self.flight.airplane
+        airplane.rows = 10
+        airplane.save()
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_remaining, 10 * 6 - 1)
+
+    def test_reconcile_command_fixes_drift(self):
+        Ticket.objects.create(
+            row=1, seat=1, flight=self.flight, order=self.order
+        )
+        Flight.objects.update(seats_remaining=0)
+
+        call_command("reconcile_seats", stdout=StringIO())
+
+        self.flight.refresh_from_db()
+        self.assertEqual(self.flight.seats_remaining, 20 * 6 - 1)
+
+
+class FlightSeatsFilterTests(AuthenticatedApiTestCase):
+    def test_filter_by_min_seats(self):
+        flight = sample_flight()
+        full_flight = sample_flight()
+        Flight.objects.filter(pk=full_flight.pk).update(seats_remaining=1)
+
+        res = self.client.get(FLIGHT_LIST_URL, data={"min_seats": 2})
+
+        ids = [item["id"] for item in res.data["results"]]
+        self.assertEqual(ids, [flight.id])
+        self.assertEqual(res.data["results"][0]["tickets_available"], 120)
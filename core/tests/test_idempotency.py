@@ -0,0 +1,163 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from core.models import IdempotencyKey, Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    ORDER_LIST_URL,
+    sample_flight,
+)
+
+
+class IdempotentOrderTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.payload = {
+            "tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]
+        }
+
+    def post_order(self, key="retry-1", payload=None):
+        return self.client.post(
+            ORDER_LIST_URL,
+            payload or self.payload,
+            format="json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_replay_returns_stored_response(self):
+        first = self.post_order()
+
+        with self.assertNumQueries(1):
+            second = self.post_order()
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_key_reused_with_other_body(self):
+        self.post_order()
+
+        res = self.post_order(
+            payload={
+                "tickets": [{"flight": self.flight.id, "row": 1, "seat": 2}]
+            }
+        )
+
+        self.assertEqual(
+            res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+
+    def test_request_in_progress(self):
+        self.post_order()
+        IdempotencyKey.objects.update(status_code=None, response=None)
+
+        res = self.post_order()
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Order.objects.count(), 1)
+
+    @override_settings(IDEMPOTENCY_CLAIM_TIMEOUT=60)
+    def test_abandoned_claim_is_reclaimed(self):
+        IdempotencyKey.objects.create(
+            user=self.user,
+            key="retry-1",
+            request_hash="stale",
+        )
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        res = self.post_order()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 1)
+        stored = IdempotencyKey.objects.get()
+        self.assertEqual(stored.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(stored.request_hash, "stale")
+
+    def test_claim_released_during_race_is_retried(self):
+        create = IdempotencyKey.objects.create
+        attempts = []
+
+        def racing_create(**kwargs):
+            # The claim that won the race is gone again when it is read.
+            attempts.append(kwargs)
+            if len(attempts) == 1:
+                raise IntegrityError
+            return create(**kwargs)
+
+        with mock.patch.object(
+            IdempotencyKey.objects, "create", side_effect=racing_create
+        ):
+            res = self.post_order()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(
+            IdempotencyKey.objects.get().status_code,
+            status.HTTP_201_CREATED,
+        )
+
+    def test_failed_attempt_releases_key(self):
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            flight=self.flight,
+            order=Order.objects.create(user=self.user),
+        )
+
+        conflict = self.post_order()
+        Ticket.objects.all().delete()
+        retried = self.post_order()
+
+        self.assertEqual(conflict.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(retried.status_code, status.HTTP_201_CREATED)
+
+    def test_requests_without_key_are_not_stored(self):
+        self.client.post(ORDER_LIST_URL, self.payload, format="json")
+
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    @override_settings(IDEMPOTENCY_KEY_TTL=60)
+    def test_expired_keys(self):
+        self.post_order()
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        replay = self.post_order()
+
+        self.assertEqual(replay.status_code, status.HTTP_409_CONFLICT)
+        self.assertNotIn("Idempotent-Replayed", replay)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    @override_settings(IDEMPOTENCY_KEY_TTL=60)
+    def test_purge_expired_keys(self):
+        self.post_order(key="old")
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - timedelta(minutes=5)
+        )
+        self.post_order(key="new", payload={
+            "tickets": [{"flight": self.flight.id, "row": 2, "seat": 2}]
+        })
+
+        out = StringIO()
+        call_command("purge_idempotency_keys", stdout=out)
+
+        self.assertIn("Deleted 1", out.getvalue())
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)),
+            ["new"]
+        )
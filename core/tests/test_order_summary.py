@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import Airport, Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    ORDER_LIST_URL,
+    sample_flight,
+)
+
+
+def order_detail_url(order_id):
+    return reverse("core:order-detail", args=[order_id])
+
+
+class OrderSummaryTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.early = sample_flight(
+            departure_time=datetime(2030, 1, 1, 7, tzinfo=timezone.utc),
+            arrival_time=datetime(2030, 1, 1, 9, tzinfo=timezone.utc),
+        )
+        self.late = sample_flight(
+            route_params={
+                "source_city_name": "Lviv", "dest_city_name": "Odesa"
+            },
+            departure_time=datetime(2030, 1, 5, 7, tzinfo=timezone.utc),
+            arrival_time=datetime(2030, 1, 5, 9, tzinfo=timezone.utc),
+        )
+        res = self.client.post(
+            ORDER_LIST_URL,
+            {
+                "tickets": [
+                    {"flight": self.late.id, "row": 1, "seat": 1},
+                    {"flight": self.early.id, "row": 1, "seat": 1},
+                ]
+            },
+            format="json",
+        )
+        self.order = Order.objects.get(pk=res.data["id"])
+
+    def test_booking_fills_summary(self):
+        self.assertEqual(self.order.ticket_count, 2)
+        self.assertEqual(
+            self.order.first_departure, self.early.departure_time
+        )
+        self.assertEqual(
+            self.order.route_label, "Kyiv Airport -> Warsaw Airport"
+        )
+
+    def test_list_returns_summary_newest_first(self):
+        newer = Order.objects.create(user=self.user)
+
+        res = self.client.get(ORDER_LIST_URL)
+
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            [newer.id, self.order.id],
+        )
+        self.assertEqual(res.data["results"][0]["ticket_count"], 0)
+        self.assertEqual(res.data["results"][1]["ticket_count"], 2)
+
+    def test_retrieve_includes_tickets(self):
+        res = self.client.get(order_detail_url(self.order.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["tickets"]), 2)
+
+    def test_ticket_changes_update_summary(self):
+        Ticket.objects.create(
+            row=2, seat=2, flight=self.late, order=self.order
+        )
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.ticket_count, 3)
+
+        self.order.tickets.filter(flight=self.early).delete()
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.ticket_count, 2)
+        self.assertEqual(
+            self.order.route_label, "Lviv Airport -> Odesa Airport"
+        )
+
+    def test_rescheduled_flight_updates_summary(self):
+        self.late.departure_time = datetime(
+            2029, 12, 31, 7, tzinfo=timezone.utc
+        )
+        self.late.save()
+
+        self.order.refresh_from_db()
+        self.assertEqual(
+            self.order.first_departure, self.late.departure_time
+        )
+        self.assertEqual(
+            self.order.route_label, "Lviv Airport -> Odesa Airport"
+        )
+
+    def test_renamed_airport_updates_summary(self):
+        airport = Airport.objects.get(name="Kyiv Airport")
+        airport.name = "Boryspil"
+        airport.save()
+
+        self.order.refresh_from_db()
+        self.assertEqual(
+            self.order.route_label, "Boryspil -> Warsaw Airport"
+        )
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from rest_framework import status
+
+from core.models import Order
+from core.pagination import KeysetPagination
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    FLIGHT_LIST_URL,
+    ORDER_LIST_URL,
+    sample_flight,
+)
+
+
+class KeysetPaginationTests(AuthenticatedApiTestCase):
+    def test_flight_list_defaults_to_page_numbers(self):
+        sample_flight()
+
+        res = self.client.get(FLIGHT_LIST_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn("count", res.data)
+
+    def test_flight_cursor_walks_in_departure_order(self):
+        flights = [
+            sample_flight(departure_time=datetime(2025, 12, day, 7, 0))
+            for day in (3, 1, 2)
+        ]
+        expected = [
+            flight.id
+            for flight in sorted(flights, key=lambda f: f.departure_time)
+        ]
+
+        res = self.client.get(
+            FLIGHT_LIST_URL,
+            data={"pagination": "cursor", "page_size": 2},
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        ids = [item["id"] for item in res.data["results"]]
+
+        res = self.client.get(res.data["next"])
+        ids += [item["id"] for item in res.data["results"]]
+
+        self.assertEqual(ids, expected)
+        self.assertIsNone(res.data["next"])
+
+    def test_page_size_is_capped(self):
+        cap = KeysetPagination.max_page_size
+        Order.objects.bulk_create(
+            Order(user=self.user) for _ in range(cap + 5)
+        )
+
+        res = self.client.get(
+            ORDER_LIST_URL,
+            data={"pagination": "cursor", "page_size": 1000},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), cap)
+        self.assertIsNotNone(res.data["next"])
@@ -0,0 +1,46 @@
+from rest_framework import status
+
+from core.models import Airport, City, Country, normalize_search_name
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    FLIGHT_LIST_URL,
+    sample_flight,
+)
+
+
+class SearchNameTests(AuthenticatedApiTestCase):
+    def test_normalize_search_name(self):
+        self.assertEqual(normalize_search_name("  Kraków "), "krakow")
+        self.assertEqual(normalize_search_name("MÜNCHEN"), "munchen")
+
+    def test_search_name_follows_rename(self):
+        country = Country.objects.create(name="Poland")
+        city = City.objects.create(name="Krakow", country=country)
+        city.name = "Łódź"
+        city.save()
+        airport = Airport.objects.create(name="Łódź Airport", city=city)
+
+        self.assertEqual(City.objects.search("ŁÓDŹ").get(), city)
+        self.assertEqual(Airport.objects.search("ódź air").get(), airport)
+
+    def test_filter_flights_by_accented_city(self):
+        flight = sample_flight(
+            route_params={
+                "source_city_name": "Kraków",
+                "dest_city_name": "Lviv"
+            }
+        )
+        sample_flight(
+            route_params={
+                "source_city_name": "Odesa",
+                "dest_city_name": "Berlin"
+            }
+        )
+
+        res = self.client.get(FLIGHT_LIST_URL, data={"departure_city": "krak"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in res.data["results"]],
+            [flight.id]
+        )
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from core.models import Order, Ticket
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    FLIGHT_LIST_URL,
+    sample_flight,
+)
+
+
+class FlightSearchCacheTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight = sample_flight(
+                route_params={
+                    "source_city_name": "Kyiv",
+                    "dest_city_name": "London"
+                }
+            )
+        self.params = {"departure_city": "Kyiv"}
+
+    def test_repeated_search_skips_database(self):
+        first = self.client.get(FLIGHT_LIST_URL, data=self.params)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(
+                FLIGHT_LIST_URL,
+                data={"departure_city": " KYIV "}
+            )
+
+        self.assertEqual(first.data, second.data)
+
+    def test_ticket_on_route_invalidates_search(self):
+        self.client.get(FLIGHT_LIST_URL, data=self.params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                row=1,
+                seat=1,
+                flight=self.flight,
+                order=Order.objects.create(user=self.user),
+            )
+
+        res = self.client.get(FLIGHT_LIST_URL, data=self.params)
+        self.assertEqual(res.data["results"][0]["tickets_available"], 119)
+
+    def test_other_route_keeps_search_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            other = sample_flight(
+                route_params={
+                    "source_city_name": "Odesa",
+                    "dest_city_name": "Berlin"
+                }
+            )
+        self.client.get(FLIGHT_LIST_URL, data=self.params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                row=1,
+                seat=1,
+                flight=other,
+                order=Order.objects.create(user=self.user),
+            )
+
+        with self.assertNumQueries(0):
+            self.client.get(FLIGHT_LIST_URL, data=self.params)
+
+    def test_flight_moved_to_searched_date_invalidates(self):
+        params = {"departure_date": "2025-12-05"}
+        res = self.client.get(FLIGHT_LIST_URL, data=params)
+        self.assertEqual(res.data["results"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight.departure_time = datetime(2025, 12, 5, 7, 0)
+            self.flight.save()
+
+        res = self.client.get(FLIGHT_LIST_URL, data=params)
+        self.assertEqual(len(res.data["results"]), 1)
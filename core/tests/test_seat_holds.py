@@ -0,0 +1,170 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from core.models import Flight, SeatHold
+from core.seatmap import get_seat_map
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    ORDER_LIST_URL,
+    sample_flight,
+)
+
+SEAT_HOLD_LIST_URL = reverse("core:seathold-list")
+
+
+def seat_hold_detail_url(hold_id):
+    return reverse("core:seathold-detail", args=[hold_id])
+
+
+class SeatHoldApiTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.flight = sample_flight()
+        self.other_user = get_user_model().objects.create_user(
+            email="other@test.com",
+            password="12345"
+        )
+
+    def seats_remaining(self):
+        return Flight.objects.get(pk=self.flight.id).seats_remaining
+
+    def hold(self, *seats):
+        return self.client.post(
+            SEAT_HOLD_LIST_URL,
+            {
+                "flight": self.flight.id,
+                "seats": [{"row": row, "seat": seat} for row, seat in seats],
+            },
+            format="json",
+        )
+
+    def hold_for_other_user(self, row, seat, expires_in=600):
+        return SeatHold.objects.create(
+            flight=self.flight,
+            user=self.other_user,
+            row=row,
+            seat=seat,
+            expires_at=timezone.now() + timedelta(seconds=expires_in),
+        )
+
+    def test_hold_counts_against_availability(self):
+        res = self.hold((1, 1), (1, 2))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 2)
+        self.assertEqual(self.seats_remaining(), 118)
+        self.assertEqual(
+            get_seat_map(self.flight.id).taken_seats(), {1: [1, 2]}
+        )
+
+    def test_holding_again_renews_expiry(self):
+        first = self.hold((1, 1))
+        second = self.hold((1, 1))
+
+        self.assertEqual(first.data[0]["id"], second.data[0]["id"])
+        self.assertGreater(
+            second.data[0]["expires_at"], first.data[0]["expires_at"]
+        )
+        self.assertEqual(self.seats_remaining(), 119)
+
+    def test_seat_held_by_someone_else(self):
+        self.hold_for_other_user(1, 1)
+
+        hold = self.hold((1, 1))
+        order = self.client.post(
+            ORDER_LIST_URL,
+            {"tickets": [{"flight": self.flight.id, "row": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(hold.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(hold.data["conflicts"][0]["reason"], "held")
+        self.assertEqual(order.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(order.data["conflicts"][0]["reason"], "held")
+
+    def test_order_converts_own_holds(self):
+        self.hold((2, 3))
+
+        res = self.client.post(
+            ORDER_LIST_URL,
+            {"tickets": [{"flight": self.flight.id, "row": 2, "seat": 3}]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(self.seats_remaining(), 119)
+
+    def test_expired_hold_is_reclaimed_lazily(self):
+        self.hold_for_other_user(1, 1, expires_in=-1)
+        Flight.objects.filter(pk=self.flight.id).reconcile_seats()
+
+        res = self.hold((1, 1))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(SeatHold.objects.get().user, self.user)
+        self.assertEqual(self.seats_remaining(), 119)
+
+    def test_release_hold(self):
+        hold_id = self.hold((1, 1)).data[0]["id"]
+
+        res = self.client.delete(seat_hold_detail_url(hold_id))
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.seats_remaining(), 120)
+
+    def test_list_only_own_active_holds(self):
+        self.hold((1, 1))
+        self.hold_for_other_user(1, 2)
+
+        res = self.client.get(SEAT_HOLD_LIST_URL)
+
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_sweeper_releases_expired_holds(self):
+        self.hold_for_other_user(1, 1, expires_in=-1)
+        self.hold_for_other_user(1, 2)
+        Flight.objects.filter(pk=self.flight.id).update(seats_remaining=118)
+
+        out = StringIO()
+        call_command("release_expired_holds", stdout=out)
+
+        self.assertIn("Released 1", out.getvalue())
+        self.assertEqual(SeatHold.objects.count(), 1)
+        self.assertEqual(self.seats_remaining(), 119)
+
+    def test_reconcile_counts_unreleased_holds(self):
+        self.hold_for_other_user(1, 1)
+        self.hold_for_other_user(1, 2, expires_in=-1)
+
+        Flight.objects.filter(pk=self.flight.id).reconcile_seats()
+
+        self.assertEqual(self.seats_remaining(), 118)
+
+    def test_deleting_user_releases_holds(self):
+        self.hold_for_other_user(1, 1)
+        self.hold_for_other_user(1, 2)
+        Flight.objects.filter(pk=self.flight.id).reconcile_seats()
+        self.assertEqual(self.seats_remaining(), 118)
+
+        self.other_user.delete()
+
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(self.seats_remaining(), 120)
+
+    def test_admin_delete_releases_holds(self):
+        self.hold((1, 1), (1, 2))
+        model_admin = admin.site._registry[SeatHold]
+
+        model_admin.delete_queryset(None, SeatHold.objects.all())
+
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(self.seats_remaining(), 120)
+        self.assertFalse(model_admin.has_add_permission(None))
@@ -0,0 +1,151 @@
+import base64
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import Order, Ticket
+from core.seatmap import SeatMap, get_seat_map
+from core.tests.test_airport_api import (
+    AuthenticatedApiTestCase,
+    flight_detail_url,
+    sample_flight,
+)
+
+
+def seatmap_url(flight_id):
+    return reverse("core:flight-seatmap", args=[flight_id])
+
+
+class SeatMapTests(TestCase):
+    def test_bits_are_packed_row_major(self):
+        seat_map = SeatMap(rows=2, seats_in_row=6)
+        seat_map.take(1, 1)
+        seat_map.take(2, 3)
+
+        self.assertEqual(len(seat_map.bits), 2)
+        self.assertEqual(seat_map.bits, bytearray([0b00000001, 0b00000001]))
+        self.assertTrue(seat_map.is_taken(2, 3))
+        self.assertEqual(seat_map.taken_count, 2)
+        self.assertEqual(seat_map.taken_seats(), {1: [1], 2: [3]})
+
+        seat_map.release(1, 1)
+        self.assertFalse(seat_map.is_taken(1, 1))
+        self.assertEqual(seat_map.taken_count, 1)
+
+
+class FindBlockTests(TestCase):
+    def test_first_row_with_adjacent_free_seats(self):
+        seat_map = SeatMap(rows=3, seats_in_row=6)
+        for seat in (1, 3, 5):
+            seat_map.take(1, seat)
+
+        self.assertEqual(seat_map.find_block(1), [(1, 2)])
+        self.assertEqual(seat_map.find_block(2), [(2, 1), (2, 2)])
+
+    def test_fewest_adjacent_rows_when_no_row_fits(self):
+        seat_map = SeatMap(rows=4, seats_in_row=4)
+        for seat in (1, 2, 3, 4):
+            seat_map.take(1, seat)
+        seat_map.take(2, 2)
+        seat_map.take(3, 2)
+
+        self.assertEqual(
+            seat_map.find_block(4),
+            [(4, 1), (4, 2), (4, 3), (4, 4)]
+        )
+        self.assertEqual(
+            seat_map.find_block(6),
+            [(2, 1), (2, 3), (2, 4), (3, 1), (3, 3), (3, 4)]
+        )
+
+    def test_split_seats_of_a_single_row(self):
+        seat_map = SeatMap(rows=1, seats_in_row=4)
+        seat_map.take(1, 2)
+        seat_map.take(1, 4)
+
+        self.assertEqual(seat_map.find_block(1), [(1, 1)])
+        self.assertEqual(seat_map.find_block(2), [(1, 1), (1, 3)])
+
+    def test_no_block_left(self):
+        seat_map = SeatMap(rows=1, seats_in_row=2)
+        seat_map.take(1, 1)
+
+        self.assertIsNone(seat_map.find_block(2))
+
+
+class SeatMapApiTests(AuthenticatedApiTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.flight = sample_flight()
+            self.order = Order.objects.create(user=self.user)
+            Ticket.objects.create(
+                row=2, seat=4, flight=self.flight, order=self.order
+            )
+
+    def test_seatmap_lists_taken_seats(self):
+        res = self.client.get(seatmap_url(self.flight.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["rows"], 20)
+        self.assertEqual(res.data["seats_in_row"], 6)
+        self.assertEqual(res.data["tickets_available"], 119)
+        self.assertEqual(res.data["taken_seats"], {"2": [4]})
+
+    def test_seatmap_base64_encoding(self):
+        res = self.client.get(
+            seatmap_url(self.flight.id), data={"encoding": "base64"}
+        )
+
+        bits = base64.b64decode(res.data["bitset"])
+        seat_map = SeatMap(20, 6, bits)
+        self.assertEqual(len(bits), 15)
+        self.assertTrue(seat_map.is_taken(2, 4))
+        self.assertEqual(seat_map.taken_count, 1)
+
+    def test_seatmap_is_cached(self):
+        self.client.get(seatmap_url(self.flight.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(seatmap_url(self.flight.id))
+
+        self.assertEqual(res.data["taken_seats"], {"2": [4]})
+
+    def test_new_ticket_invalidates_seatmap(self):
+        get_seat_map(self.flight.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.create(
+                row=3, seat=1, flight=self.flight, order=self.order
+            )
+
+        res = self.client.get(seatmap_url(self.flight.id))
+        self.assertEqual(res.data["taken_seats"], {"2": [4], "3": [1]})
+
+    def test_flight_retrieve_uses_seatmap(self):
+        res = self.client.get(flight_detail_url(self.flight.id))
+
+        self.assertEqual(res.data["taken_seats"], {2: [4]})
+
+    def test_seats_outside_shrunk_airplane_are_skipped(self):
+        Ticket.objects.create(
+            row=20, seat=6, flight=self.flight, order=self.order
+        )
+        airplane = self.flight.airplane
+        airplane.rows = 10
+        airplane.seats_in_row = 4
+        with self.captureOnCommitCallbacks(execute=True):
+            airplane.save()
+
+        seatmap = self.client.get(seatmap_url(self.flight.id))
+        detail = self.client.get(flight_detail_url(self.flight.id))
+
+        self.assertEqual(seatmap.status_code, status.HTTP_200_OK)
+        self.assertEqual(seatmap.data["taken_seats"], {"2": [4]})
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+
+    def test_seatmap_unknown_flight(self):
+        res = self.client.get(seatmap_url(self.flight.id + 100))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
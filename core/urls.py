@@ -12,7 +12,9 @@ from core.views import (
     CityViewSet,
     CountryViewSet,
     AirplaneViewSet,
-    AirplaneTypeViewSet
+    AirplaneTypeViewSet,
+    SeatHoldViewSet,
+    BookingRequestViewSet,
 )
 
 app_name = "core"
@@ -25,6 +27,8 @@ router.register("crews", CrewViewSet)
 router.register("positions", PositionViewSet)
 router.register("tickets", TicketViewSet)
 router.register("orders", OrderViewSet)
+router.register("seat-holds", SeatHoldViewSet)
+router.register("booking-requests", BookingRequestViewSet)
 router.register("airplanes", AirplaneViewSet)
 router.register("airplane-types", AirplaneTypeViewSet)
 router.register("routes", RouteViewSet)
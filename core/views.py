@@ -1,14 +1,58 @@
-from django.db.models import Count, F, Prefetch
+from datetime import datetime, time, timedelta
+
+from django.db.models import Count, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.http import FileResponse
+from django.utils import timezone
 from django.utils.dateparse import parse_date
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 
 from rest_framework.viewsets import GenericViewSet
 
+from core.boarding_passes import (
+    PASS_CONTENT_TYPES,
+    boarding_pass_path,
+    flight_details,
+)
+from core.booking import (
+    cancel_orders,
+    cancel_tickets,
+    hold_seats,
+    release_holds,
+)
+from core.cache import (
+    airport_codes,
+    calendar_cache_key,
+    get_cached,
+    get_cached_search,
+    get_generations,
+    set_cached,
+    set_cached_search,
+)
+from core.connections import (
+    flight_graph,
+    itinerary_distance,
+    itinerary_duration,
+)
+from core.exports import (
+    MANIFEST_COLUMNS,
+    ORDER_COLUMNS,
+    SCHEDULE_COLUMNS,
+    export_rows,
+    manifest_queryset,
+    orders_queryset,
+    schedule_queryset,
+    streaming_export,
+)
+from core.booking_queue import QUEUE_PARAMETERS, QueuedBookingMixin
+from core.idempotency import IDEMPOTENCY_PARAMETERS, IdempotentCreateMixin
 from core.models import (
     Flight,
     Crew,
@@ -20,14 +64,26 @@ from core.models import (
     Route,
     City,
     Country,
-    Airplane
+    Airplane,
+    SeatHold,
+    BookingRequest,
 )
+from core.pagination import (
+    KeysetPaginationMixin,
+    FlightKeysetPagination,
+    TicketKeysetPagination,
+    OrderKeysetPagination,
+)
+from core.query_plan import SparseFieldsetMixin
+from core.seatmap import get_seat_map
 from core.serializers import (
+    BookingRequestSerializer,
     FlightSerializer,
     CrewSerializer,
     PositionSerializer,
     TicketSerializer,
     OrderSerializer,
+    OrderListSerializer,
     AirplaneSerializer,
     AirplaneTypeSerializer,
     RouteSerializer,
@@ -43,12 +99,107 @@ from core.serializers import (
     FlightRetrieveSerializer,
     AirplaneImageSerializer,
     FlightCreateUpdateSerializer, OrderCreateSerializer,
+    ConnectionSearchSerializer,
+    ConnectionSerializer,
+    CalendarSearchSerializer,
+    CalendarDaySerializer,
+    BoardingPassSerializer,
+    ExportSerializer,
+    ManifestEntrySerializer,
+    ManifestSerializer,
+    SeatMapSerializer,
+    SeatHoldSerializer,
+    SeatHoldCreateSerializer,
 )
 
 
-class FlightViewSet(viewsets.ModelViewSet):
+def day_start(date_obj, days: int = 0) -> datetime:
+    """Aware midnight of ``date_obj`` (plus ``days``) for range filters."""
+    return timezone.make_aware(
+        datetime.combine(date_obj + timedelta(days=days), time.min)
+    )
+
+
+def route_ids(**filters) -> list[int]:
+    """Resolve a route filter to ids up front so flights filter by FK."""
+    return list(Route.objects.filter(**filters).values_list("id", flat=True))
+
+
+def coded_route_ids(field: str, code: str) -> list[int]:
+    """Routes whose ``field`` airport has this IATA or ICAO code."""
+    airport_id = airport_codes().get(code.strip().upper())
+    if airport_id is None:
+        return []
+    return route_ids(**{field: airport_id})
+
+
+AIRPORT_CODE_PARAMETERS = [
+    OpenApiParameter(
+        "source_code",
+        type=str,
+        description=(
+                "Exact IATA or ICAO code of the departure airport"
+                " (ex. ?source_code=KBP)"
+        ),
+    ),
+    OpenApiParameter(
+        "destination_code",
+        type=str,
+        description=(
+                "Exact IATA or ICAO code of the arrival airport"
+                " (ex. ?destination_code=WAW)"
+        ),
+    ),
+]
+
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type=str,
+        description=(
+                "Comma separated fields to return"
+                " (ex. ?fields=id,departure_time)"
+        ),
+    ),
+    OpenApiParameter(
+        "omit",
+        type=str,
+        description="Comma separated fields to leave out (ex. ?omit=route)",
+    ),
+]
+
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        "pagination",
+        type=str,
+        enum=["cursor"],
+        description=(
+                "Use keyset pagination instead of page numbers"
+                " (ex. ?pagination=cursor)"
+        ),
+    ),
+    OpenApiParameter(
+        "cursor",
+        type=str,
+        description="Opaque cursor from a previous keyset page",
+    ),
+    OpenApiParameter(
+        "page_size",
+        type=int,
+        description="Keyset page size, capped at 100 (ex. ?page_size=50)",
+    ),
+]
+
+
+class FlightViewSet(
+    SparseFieldsetMixin,
+    KeysetPaginationMixin,
+    viewsets.ModelViewSet
+):
     queryset = Flight.objects.all()
     serializer_class = FlightSerializer
+    keyset_pagination_class = FlightKeysetPagination
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -64,59 +215,90 @@ class FlightViewSet(viewsets.ModelViewSet):
         arrival_city = self.request.query_params.get("arrival_city")
         departure_date = self.request.query_params.get("departure_date")
         arrival_date = self.request.query_params.get("arrival_date")
-
+        date_from = self.request.query_params.get("date_from")
+        date_to = self.request.query_params.get("date_to")
+        min_seats = self.request.query_params.get("min_seats")
+        codes = {
+            field: self.request.query_params.get(f"{field}_code")
+            for field in ("source", "destination")
+        }
+
+        self.search_scopes = {"global"}
         if departure_city:
-            queryset = (queryset.filter
-                        (route__source__city__name__icontains=departure_city)
-                        )
+            ids = route_ids(
+                source__city__in=City.objects.search(departure_city)
+            )
+            queryset = queryset.filter(route_id__in=ids)
+            self.search_scopes |= {f"route:{route_id}" for route_id in ids}
 
         if arrival_city:
-            queryset = queryset.filter(
-                route__destination__city__name__icontains=arrival_city
+            ids = route_ids(
+                destination__city__in=City.objects.search(arrival_city)
             )
+            queryset = queryset.filter(route_id__in=ids)
+            self.search_scopes |= {f"route:{route_id}" for route_id in ids}
+
+        for field, code in codes.items():
+            if code:
+                ids = coded_route_ids(field, code)
+                queryset = queryset.filter(route_id__in=ids)
+                self.search_scopes |= {
+                    f"route:{route_id}" for route_id in ids
+                }
+
+        if not (departure_city or arrival_city or any(codes.values())):
+            date_obj = None
+            if departure_date and not (arrival_date or date_from or date_to):
+                date_obj = parse_date(departure_date)
+            if date_obj:
+                self.search_scopes.add(f"date:{date_obj.isoformat()}")
+            else:
+                self.search_scopes.add("all")
 
         if departure_date:
             date_obj = parse_date(departure_date)
             if date_obj:
-                queryset = queryset.filter(departure_time__date=date_obj)
+                queryset = queryset.filter(
+                    departure_time__gte=day_start(date_obj),
+                    departure_time__lt=day_start(date_obj, days=1),
+                )
 
         if arrival_date:
             date_obj = parse_date(arrival_date)
             if date_obj:
-                queryset = queryset.filter(arrival_time__date=date_obj)
-
-        if self.action == "list":
-            queryset = (
-                queryset
-                .select_related(
-                    "airplane__airplane_type",
-                    "route__source__city__country",
-                    "route__destination__city__country",
-                )
-                .prefetch_related(
-                    "crews__position",
+                queryset = queryset.filter(
+                    arrival_time__gte=day_start(date_obj),
+                    arrival_time__lt=day_start(date_obj, days=1),
                 )
-                .annotate(
-                    tickets_available=(
-                            F("airplane__seats_in_row") * F("airplane__rows")
-                            - Count("tickets", distinct=True)
-                    ),
-                    crew_count=Count("crews", distinct=True),
+
+        if date_from:
+            date_obj = parse_date(date_from)
+            if date_obj:
+                queryset = queryset.filter(
+                    departure_time__gte=day_start(date_obj)
                 )
-            )
-        if self.action == "retrieve":
-            queryset = (
-                queryset
-                .select_related(
-                    "airplane__airplane_type",
-                    "route__source__city__country",
-                    "route__destination__city__country"
+
+        if date_to:
+            date_obj = parse_date(date_to)
+            if date_obj:
+                queryset = queryset.filter(
+                    departure_time__lt=day_start(date_obj, days=1)
                 )
-                .prefetch_related(
-                    "crews__position",
-                    "tickets__order__user"
+
+        if min_seats and min_seats.isdigit():
+            queryset = queryset.filter(seats_remaining__gte=int(min_seats))
+
+        if self.action == "list":
+            if "crews" in self.get_serializer_fields():
+                crew_count = Flight.crews.through.objects.filter(
+                    flight=OuterRef("pk")
+                ).order_by().values("flight").annotate(
+                    count=Count("pk")
+                ).values("count")
+                queryset = queryset.annotate(
+                    crew_count=Coalesce(Subquery(crew_count), 0),
                 )
-            )
+            queryset = queryset.order_by("departure_time", "id")
         return queryset
 
     @extend_schema(
@@ -154,13 +336,248 @@ class FlightViewSet(viewsets.ModelViewSet):
                         " (ex. ?arrival_date=2025-09-07)"
                 ),
             ),
+            OpenApiParameter(
+                "date_from",
+                type=str,
+                description=(
+                        "Filter flights departing on or after this date"
+                        " (ex. ?date_from=2025-08-30)"
+                ),
+            ),
+            OpenApiParameter(
+                "date_to",
+                type=str,
+                description=(
+                        "Filter flights departing on or before this date"
+                        " (ex. ?date_to=2025-09-07)"
+                ),
+            ),
+            OpenApiParameter(
+                "min_seats",
+                type=int,
+                description=(
+                        "Filter flights with at least this many free seats"
+                        " (ex. ?min_seats=2)"
+                ),
+            ),
+            *AIRPORT_CODE_PARAMETERS,
+            *PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        data = get_cached_search(request)
+        if data is not None:
+            return Response(data)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        generations = get_generations(self.search_scopes)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+
+        set_cached_search(request, response.data, generations)
+        return response
 
+    @extend_schema(
+        parameters=[ConnectionSearchSerializer],
+        responses=ConnectionSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="connections")
+    def connections(self, request):
+        """Itineraries of up to max_legs flights between two cities"""
+        params = ConnectionSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        search = params.validated_data
+
+        departure_from = day_start(search["departure_date"])
+        itineraries = flight_graph.search(
+            sources=set(Airport.objects.filter(
+                city__in=City.objects.search(search["departure_city"])
+            ).values_list("id", flat=True)),
+            destinations=set(Airport.objects.filter(
+                city__in=City.objects.search(search["arrival_city"])
+            ).values_list("id", flat=True)),
+            departure_from=max(departure_from, timezone.now()),
+            departure_to=day_start(search["departure_date"], days=1),
+            max_legs=search["max_legs"],
+            min_layover=timedelta(minutes=search["min_layover"]),
+            max_layover=timedelta(minutes=search["max_layover"]),
+        )
+        if search["ordering"] == "distance":
+            itineraries.sort(
+                key=lambda legs: (
+                    itinerary_distance(legs), itinerary_duration(legs)
+                )
+            )
+        else:
+            itineraries.sort(
+                key=lambda legs: (
+                    itinerary_duration(legs), itinerary_distance(legs)
+                )
+            )
+
+        flights = Flight.objects.select_related(
+            "route__source__city__country",
+            "route__destination__city__country",
+        ).in_bulk(
+            {leg.flight_id for legs in itineraries for leg in legs}
+        )
+        results = []
+        for legs in itineraries:
+            leg_flights = [flights.get(leg.flight_id) for leg in legs]
+            if any(
+                    flight is None or flight.seats_remaining < search["seats"]
+                    for flight in leg_flights
+            ):
+                continue
+            results.append({
+                "legs": leg_flights,
+                "duration": itinerary_duration(legs),
+                "distance": itinerary_distance(legs),
+            })
+            if len(results) == search["limit"]:
+                break
+
+        serializer = ConnectionSerializer(results, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        parameters=[CalendarSearchSerializer],
+        responses=CalendarDaySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="calendar")
+    def calendar(self, request):
+        """Per-day flight count, earliest departure and free seats"""
+        params = CalendarSearchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        search = params.validated_data
+
+        ids = set(route_ids(
+            source__city__in=City.objects.search(search["departure_city"])
+        )) & set(route_ids(
+            destination__city__in=City.objects.search(search["arrival_city"])
+        ))
+        month = search["month"]
+        key = calendar_cache_key(ids, month)
+        data = get_cached(key)
+        if data is not None:
+            return Response(data)
+
+        generations = get_generations(
+            {"global"} | {f"route:{route_id}" for route_id in ids}
+        )
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        days = (
+            Flight.objects
+            .filter(
+                route_id__in=ids,
+                departure_time__gte=day_start(month),
+                departure_time__lt=day_start(next_month),
+            )
+            .annotate(day=TruncDate("departure_time"))
+            .values("day")
+            .annotate(
+                flights=Count("id"),
+                earliest_departure=Min("departure_time"),
+                tickets_available=Sum("seats_remaining"),
+            )
+            .order_by("day")
+        )
+        data = CalendarDaySerializer(days, many=True).data
+        set_cached(key, data, generations)
+        return Response(data)
+
+    @extend_schema(parameters=[ExportSerializer], responses=str)
+    @action(methods=["GET"], detail=False, url_path="export")
+    def export(self, request):
+        """Stream the forward schedule as NDJSON or CSV"""
+        params = ExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data["output"]
+
+        rows = export_rows(
+            schedule_queryset(
+                params.validated_data.get("since", timezone.now()),
+                params.validated_data.get("until"),
+            ),
+            SCHEDULE_COLUMNS,
+        )
+        return streaming_export(rows, SCHEDULE_COLUMNS, output, "schedule")
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "encoding",
+                type=str,
+                enum=["json", "base64"],
+                description="Seat list (default) or the raw packed bitset",
+            ),
+        ],
+        responses=SeatMapSerializer,
+    )
+    @action(methods=["GET"], detail=True, url_path="seatmap")
+    def seatmap(self, request, pk=None):
+        """Taken seats of one flight, served from the cached bitset"""
+        try:
+            seat_map = get_seat_map(int(pk))
+        except (ValueError, Flight.DoesNotExist):
+            raise NotFound()
+
+        data = {
+            "id": int(pk),
+            "rows": seat_map.rows,
+            "seats_in_row": seat_map.seats_in_row,
+            "tickets_available": seat_map.capacity - seat_map.taken_count,
+        }
+        if request.query_params.get("encoding") == "base64":
+            data["bitset"] = seat_map.to_base64()
+        else:
+            data["taken_seats"] = seat_map.taken_seats()
+        return Response(SeatMapSerializer(data).data)
+
+    @extend_schema(
+        parameters=[ManifestSerializer],
+        responses={
+            (200, "application/json"): ManifestEntrySerializer(many=True),
+            (200, "text/csv"): OpenApiTypes.STR,
+        },
+    )
+    @action(
+        methods=["GET"],
+        detail=True,
+        permission_classes=(IsAdminUser,),
+        pagination_class=None,
+    )
+    def manifest(self, request, pk=None):
+        """Passengers of one flight by seat, as JSON or CSV"""
+        params = ManifestSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        try:
+            flight_id = int(pk)
+        except ValueError:
+            raise NotFound()
+
+        # Plain dicts straight from values_list(), no serializer fields.
+        rows = list(
+            export_rows(manifest_queryset(flight_id), MANIFEST_COLUMNS)
+        )
+        if not rows and not Flight.objects.filter(pk=flight_id).exists():
+            raise NotFound()
+        output = params.validated_data["output"]
+        if output == "csv":
+            return streaming_export(
+                rows, MANIFEST_COLUMNS, output, f"manifest-{flight_id}"
+            )
+        return Response(rows)
 
-class CrewViewSet(viewsets.ModelViewSet):
+
+class CrewViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
 
@@ -177,8 +594,6 @@ class CrewViewSet(viewsets.ModelViewSet):
         if position:
             queryset = queryset.filter(position__name__icontains=position)
 
-        if self.action in ["list", "retrieve"]:
-            queryset = queryset.select_related("position")
         return queryset
 
     @extend_schema(
@@ -194,14 +609,19 @@ class CrewViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class PositionViewSet(viewsets.ModelViewSet):
+class PositionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Position.objects.all()
     serializer_class = PositionSerializer
 
 
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(
+    SparseFieldsetMixin,
+    KeysetPaginationMixin,
+    viewsets.ModelViewSet
+):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
+    keyset_pagination_class = TicketKeysetPagination
 
     def get_queryset(self):
         queryset = self.queryset
@@ -210,26 +630,23 @@ class TicketViewSet(viewsets.ModelViewSet):
         destination = self.request.query_params.get("destination")
 
         if source:
-            queryset = (queryset.filter
-                        (flight__route__source__name__icontains=source)
-                        )
+            queryset = queryset.filter(flight__route_id__in=route_ids(
+                source__in=Airport.objects.search(source)
+            ))
 
         if destination:
-            queryset = queryset.filter(
-                flight__route__destination__name__icontains=destination
-            )
+            queryset = queryset.filter(flight__route_id__in=route_ids(
+                destination__in=Airport.objects.search(destination)
+            ))
+
+        for field in ("source", "destination"):
+            code = self.request.query_params.get(f"{field}_code")
+            if code:
+                queryset = queryset.filter(
+                    flight__route_id__in=coded_route_ids(field, code)
+                )
 
-        if self.action in ["list", "retrieve"]:
-            queryset = queryset.select_related(
-                "flight__airplane",
-                "flight__airplane__airplane_type",
-                "flight__route__destination__city__country",
-                "flight__route__source__city__country",
-                "order__user"
-            ).prefetch_related(
-                "flight__crews__position"
-            )
-        return queryset
+        return queryset.order_by("id")
 
     @extend_schema(
         parameters=[
@@ -248,14 +665,73 @@ class TicketViewSet(viewsets.ModelViewSet):
                         "Filter flights arriving to this city"
                         " (ex. ?destination=Lviv)"
                 )
-            )
+            ),
+            *AIRPORT_CODE_PARAMETERS,
+            *PAGINATION_PARAMETERS,
+            *FIELDSET_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    def own_tickets(self, pk):
+        """The ticket ``pk`` as a queryset, if the user may see it."""
+        try:
+            tickets = Ticket.objects.filter(pk=int(pk))
+        except ValueError:
+            raise NotFound()
+        if not self.request.user.is_staff:
+            tickets = tickets.filter(order__user=self.request.user)
+        return tickets
+
+    @extend_schema(request=None, responses={204: None})
+    @action(
+        methods=["POST"],
+        detail=True,
+        permission_classes=(IsAuthenticated,),
+    )
+    def cancel(self, request, pk=None):
+        """Cancel one ticket and give its seat back to the flight"""
+        if not cancel_tickets(self.own_tickets(pk)):
+            raise NotFound()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(parameters=[BoardingPassSerializer], responses=bytes)
+    @action(
+        methods=["GET"],
+        detail=True,
+        permission_classes=(IsAuthenticated,),
+        url_path="boarding-pass",
+    )
+    def boarding_pass(self, request, pk=None):
+        """Download a boarding pass made by generate_boarding_passes"""
+        params = BoardingPassSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data["output"]
+
+        ticket = self.own_tickets(pk).values("id", "flight_id").first()
+        if ticket is None:
+            raise NotFound()
+
+        # Passes are rendered in bulk offline, never inside a request.
+        flight_id = ticket["flight_id"]
+        flight = flight_details([flight_id])[flight_id]
+        path = boarding_pass_path(flight, ticket["id"], output)
+        if not path.exists():
+            raise NotFound("Boarding pass has not been generated yet.")
+        return FileResponse(
+            path.open("rb"),
+            as_attachment=True,
+            filename=f"boarding-pass-{ticket['id']}.{output}",
+            content_type=PASS_CONTENT_TYPES[output],
+        )
+
 
 class OrderViewSet(
+    IdempotentCreateMixin,
+    QueuedBookingMixin,
+    SparseFieldsetMixin,
+    KeysetPaginationMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -263,10 +739,13 @@ class OrderViewSet(
 ):
     queryset = Order.objects.all()
     permission_classes = (IsAuthenticated,)
+    keyset_pagination_class = OrderKeysetPagination
 
     def get_serializer_class(self):
         if self.action == "create":
             return OrderCreateSerializer
+        if self.action == "list":
+            return OrderListSerializer
         return OrderSerializer
 
     def get_queryset(self):
@@ -275,21 +754,110 @@ class OrderViewSet(
             queryset = queryset
         else:
             queryset = queryset.filter(user=self.request.user)
-        ticket_queryset = Ticket.objects.select_related(
-            "flight__airplane",
-            "flight__route__source__city__country",
-            "flight__route__destination__city__country",
-        )
-        queryset = queryset.prefetch_related(
-            Prefetch("tickets", queryset=ticket_queryset),
-        ).select_related("user")
-        return queryset
+        return queryset.order_by("-create_at", "-id")
+
+    @extend_schema(
+        parameters=[*PAGINATION_PARAMETERS, *FIELDSET_PARAMETERS]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[*IDEMPOTENCY_PARAMETERS, *QUEUE_PARAMETERS],
+        responses={
+            201: OrderCreateSerializer,
+            202: BookingRequestSerializer,
+        },
+    )
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @extend_schema(parameters=[ExportSerializer], responses=str)
+    @action(
+        methods=["GET"],
+        detail=False,
+        permission_classes=(IsAdminUser,),
+    )
+    def export(self, request):
+        """Stream every ticket of orders placed in a range as NDJSON or CSV"""
+        params = ExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        output = params.validated_data["output"]
+
+        rows = export_rows(
+            orders_queryset(
+                params.validated_data.get("since"),
+                params.validated_data.get("until"),
+            ),
+            ORDER_COLUMNS,
+        )
+        return streaming_export(rows, ORDER_COLUMNS, output, "orders")
+
+    @extend_schema(request=None, responses={204: None})
+    @action(methods=["POST"], detail=True)
+    def cancel(self, request, pk=None):
+        """Cancel the order and give its seats back to the flights"""
+        order = self.get_object()
+        cancel_orders(Order.objects.filter(pk=order.pk))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class BookingRequestViewSet(
+    SparseFieldsetMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    GenericViewSet
+):
+    """Status of orders queued with ``Prefer: respond-async``."""
+
+    queryset = BookingRequest.objects.all()
+    serializer_class = BookingRequestSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user).order_by("-id")
 
-class AirplaneViewSet(viewsets.ModelViewSet):
+
+class SeatHoldViewSet(
+    SparseFieldsetMixin,
+    mixins.ListModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet
+):
+    queryset = SeatHold.objects.all()
+    serializer_class = SeatHoldSerializer
+    permission_classes = (IsAuthenticated,)
+
+    def get_queryset(self):
+        return self.queryset.active().filter(
+            user=self.request.user
+        ).order_by("expires_at", "id")
+
+    @extend_schema(
+        request=SeatHoldCreateSerializer,
+        responses=SeatHoldSerializer(many=True),
+    )
+    def create(self, request):
+        """Hold seats on one flight until they are ordered or expire"""
+        params = SeatHoldCreateSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+
+        holds = hold_seats(
+            request.user,
+            params.validated_data["flight"],
+            params.validated_data["seats"],
+        )
+        serializer = SeatHoldSerializer(holds, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_destroy(self, instance):
+        release_holds(SeatHold.objects.filter(pk=instance.pk))
+
+
+class AirplaneViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Airplane.objects.all()
     serializer_class = AirplaneSerializer
     parser_classes = [MultiPartParser, FormParser]
@@ -301,12 +869,6 @@ class AirplaneViewSet(viewsets.ModelViewSet):
             return AirplaneImageSerializer
         return AirplaneSerializer
 
-    def get_queryset(self):
-        queryset = self.queryset
-        if self.action in ["list", "retrieve"]:
-            queryset = queryset.select_related("airplane_type")
-        return queryset
-
     @action(
         methods=["POST"],
         detail=True,
@@ -322,62 +884,41 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AirplaneTypeViewSet(viewsets.ModelViewSet):
+class AirplaneTypeViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Route.objects.all()
     serializer_class = RouteSerializer
 
-    def get_queryset(self):
-        queryset = self.queryset
-        if self.action in ["list", "retrieve"]:
-            queryset = queryset.select_related(
-                "source__city__country",
-                "destination__city__country"
-            )
-        return queryset
-
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return RouteListSerializer
         return RouteSerializer
 
 
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Airport.objects.all()
     serializer_class = AirportSerializer
 
-    def get_queryset(self):
-        queryset = self.queryset
-        if self.action in ["list", "retrieve"]:
-            queryset = queryset.select_related("city__country")
-        return queryset
-
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return AirportListSerializer
         return AirportSerializer
 
 
-class CityViewSet(viewsets.ModelViewSet):
+class CityViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = City.objects.all()
     serializer_class = CitySerializer
 
-    def get_queryset(self):
-        queryset = self.queryset
-        if self.action in ["list", "retrieve"]:
-            queryset = queryset.select_related("country")
-        return queryset
-
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return CityListSerializer
         return CitySerializer
 
 
-class CountryViewSet(viewsets.ModelViewSet):
+class CountryViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
 import socket
+import sys
 from datetime import timedelta
 from pathlib import Path
 
@@ -89,6 +90,9 @@ WSGI_APPLICATION = "flight_booking.wsgi.application"
 
 DOCKER = os.environ.get("DOCKER") == "True"
 
+# Seconds a PostgreSQL query queues for row locks before it fails
+DATABASE_LOCK_TIMEOUT = 30
+
 if DOCKER:
     DATABASES = {
         "default": {
@@ -98,6 +102,9 @@ if DOCKER:
             "PASSWORD": os.environ["POSTGRES_PASSWORD"],
             "HOST": os.environ["POSTGRES_HOST_DOCKER"],
             "PORT": os.environ["POSTGRES_PORT"],
+            "OPTIONS": {
+                "options": f"-c lock_timeout={DATABASE_LOCK_TIMEOUT}s",
+            },
         }
     }
 else:
@@ -208,3 +215,60 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True
 }
+
+# The generation counters of core.cache must be shared by every process
+# that writes: web workers, process_bookings, release_expired_holds and
+# the other commands. The default is the database table made by
+# ``manage.py createcachetable``; set CACHE_BACKEND and CACHE_LOCATION
+# for e.g. django.core.cache.backends.redis.RedisCache in production.
+# Tests run in one process and keep the faster local memory cache.
+if sys.argv[1:2] == ["test"]:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 100000},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": os.environ.get(
+                "CACHE_BACKEND",
+                "django.core.cache.backends.db.DatabaseCache",
+            ),
+            "LOCATION": os.environ.get("CACHE_LOCATION", "flight_cache"),
+            "OPTIONS": {
+                "MAX_ENTRIES": int(
+                    os.environ.get("CACHE_MAX_ENTRIES", 100000)
+                ),
+            },
+        }
+    }
+
+CONNECTIONS_GRAPH_TTL = 300
+
+FLIGHT_SEARCH_CACHE_TIMEOUT = 300
+
+SEAT_MAP_CACHE_TIMEOUT = 300
+
+# Flights whose airplane size each process keeps, see core.dimensions
+AIRPLANE_DIMENSIONS_CACHE_SIZE = 10000
+
+SEAT_HOLD_TTL = 600
+
+# "pessimistic", "optimistic" or "skip_locked", see core.booking.book_tickets
+BOOKING_CONCURRENCY = "pessimistic"
+
+BOOKING_MAX_RETRIES = 3
+
+# First wait of the skip_locked strategy for a busy flight, doubling on retry
+BOOKING_RETRY_BACKOFF = 0.05
+
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Seconds after which a key whose request never finished is claimable
+# again; keep it well above DATABASE_LOCK_TIMEOUT, or a retry could book
+# a second order while the first attempt still waits for its locks
+IDEMPOTENCY_CLAIM_TIMEOUT = 10 * 60
+
+QUERY_PLAN_DEBUG = False